@@ -157,24 +157,17 @@ async def get_current_admin(current_user: dict = Depends(get_current_user)) -> d
     return current_user
 
 
-# Optional authentication - returns None if not authenticated
-async def get_current_user_optional(credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))) -> Optional[dict]:
-    """Optional dependency to get the current authenticated user.
-    
-    Returns None if no valid token is provided instead of raising an exception.
-    Useful for endpoints that work differently for authenticated vs unauthenticated users.
+def get_user_from_token(token: str) -> Optional[dict]:
+    """Resolve a JWT token to the user it was issued for.
     
     Args:
-        credentials: The HTTP bearer token credentials (optional)
+        token: The JWT token to resolve
         
     Returns:
-        A dict containing the authenticated user's data, or None if not authenticated
+        A dict containing the user's data, or None if the token is invalid
+        or the user no longer exists
     """
-    if credentials is None:
-        return None
-    
     try:
-        token = credentials.credentials
         payload = verify_token(token)
         
         if payload is None:
@@ -198,3 +191,44 @@ async def get_current_user_optional(credentials: Optional[HTTPAuthorizationCrede
         }
     except Exception:
         return None
+
+
+def get_user_from_authorization_header(authorization: Optional[str]) -> Optional[dict]:
+    """Resolve a raw `Authorization` header value to the current user.
+    
+    Lets hot endpoints bail out before any dependency or JWT work when the
+    header is absent, which is the common case for anonymous visitors.
+    
+    Args:
+        authorization: The value of the Authorization header, if any
+        
+    Returns:
+        A dict containing the authenticated user's data, or None if not authenticated
+    """
+    if not authorization:
+        return None
+    
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    
+    return get_user_from_token(token.strip())
+
+
+# Optional authentication - returns None if not authenticated
+async def get_current_user_optional(credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))) -> Optional[dict]:
+    """Optional dependency to get the current authenticated user.
+    
+    Returns None if no valid token is provided instead of raising an exception.
+    Useful for endpoints that work differently for authenticated vs unauthenticated users.
+    
+    Args:
+        credentials: The HTTP bearer token credentials (optional)
+        
+    Returns:
+        A dict containing the authenticated user's data, or None if not authenticated
+    """
+    if credentials is None:
+        return None
+    
+    return get_user_from_token(credentials.credentials)
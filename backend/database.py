@@ -14,6 +14,7 @@ refactor these functions accordingly.
 """
 
 import json
+import orjson
 import os
 import sqlite3
 import sys
@@ -34,6 +35,15 @@ def debug_print(message: str):
 
 
 DB_NAME = os.path.join(os.path.dirname(__file__), "yupoo.db")
+# Prepared statements kept per connection by sqlite3 (default is 128)
+STATEMENT_CACHE_SIZE = 256
+# Per-connection PRAGMAs for endpoints that write many rows at once. With the
+# database in WAL mode, synchronous=NORMAL only syncs at checkpoints.
+BULK_WRITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
 IMAGES_DIR = os.path.join(os.path.dirname(__file__), "storage", "images")
 
 
@@ -43,6 +53,16 @@ def ensure_storage_dir() -> None:
     debug_print(f"Image storage directory: {IMAGES_DIR}")
 
 
+def _apply_bulk_write_pragmas(conn: sqlite3.Connection) -> None:
+    """Tune a connection for a bulk write (fewer fsyncs, in-memory temp data).
+
+    Args:
+        conn: Connection that is about to perform many writes.
+    """
+    for pragma in BULK_WRITE_PRAGMAS:
+        conn.execute(pragma)
+
+
 def init_db(db_path: str = DB_NAME) -> None:
     """Initialise the SQLite database.
 
@@ -64,6 +84,10 @@ def init_db(db_path: str = DB_NAME) -> None:
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     debug_print("Connected to SQLite database")
+    # WAL is stored in the database file, so setting it once here covers every
+    # later connection: readers no longer block writers and commits sync less
+    cursor.execute("PRAGMA journal_mode=WAL")
+    debug_print(f"Journal mode: {cursor.fetchone()[0]}")
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS products (
@@ -80,8 +104,9 @@ def init_db(db_path: str = DB_NAME) -> None:
     )
     debug_print("Created/verified products table with new schema")
     
-    # Check if colors_json column exists, add if not
-    cursor.execute("PRAGMA table_info(products)")
+    # Check if colors_json column exists, add if not (table_xinfo, unlike
+    # table_info, also lists generated columns such as has_core_tag)
+    cursor.execute("PRAGMA table_xinfo(products)")
     columns = [column[1] for column in cursor.fetchall()]
     if 'colors_json' not in columns:
         debug_print("Adding colors_json column to existing table")
@@ -90,6 +115,32 @@ def init_db(db_path: str = DB_NAME) -> None:
         except sqlite3.OperationalError as e:
             debug_print(f"Note: {e}")
     
+    # Flag rows that carry a company or type tag in a virtual column, with a
+    # partial index over the rows that don't, so the untagged-product cleanup
+    # reads only those rows instead of scanning the whole table. GLOB is
+    # case-sensitive, matching the tag.startswith() checks used in Python
+    if 'has_core_tag' not in columns:
+        debug_print("Adding has_core_tag generated column to products table")
+        try:
+            cursor.execute(
+                """
+                ALTER TABLE products ADD COLUMN has_core_tag INTEGER
+                GENERATED ALWAYS AS (
+                    tags_json GLOB '*"company_*'
+                    OR tags_json GLOB '*"type_*'
+                ) VIRTUAL
+                """
+            )
+        except sqlite3.OperationalError as e:
+            debug_print(f"Note: {e}")
+    try:
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_products_untagged "
+            "ON products(has_core_tag) WHERE has_core_tag = 0"
+        )
+    except sqlite3.OperationalError as e:
+        debug_print(f"Note: {e}")
+    
     # Create users table (replaces admin_users)
     cursor.execute(
         """
@@ -300,63 +351,51 @@ def search_products_by_tags(tag_list: List[str], db_path: str = DB_NAME, sort_by
             
         where_clauses.append(f"({' OR '.join(or_clauses)})")
     
+    # Exclusive type search: the product's type tags must be exactly the requested ones
+    if exclusive_type_search and "type" in tag_categories:
+        debug_print("Applying exclusive type search filter.")
+        requested_type_tags = [t for t in tag_categories["type"] if t.startswith("type_")]
+        type_placeholders = ", ".join("?" for _ in requested_type_tags)
+        where_clauses.append(
+            "NOT EXISTS (SELECT 1 FROM json_each(products.tags_json) "
+            "WHERE json_each.value GLOB 'type_*' "
+            f"AND json_each.value NOT IN ({type_placeholders}))"
+        )
+        all_params.extend(requested_type_tags)
+        where_clauses.append(
+            "(SELECT COUNT(*) FROM json_each(products.tags_json) "
+            "WHERE json_each.value GLOB 'type_*') = ?"
+        )
+        all_params.append(len(requested_type_tags))
+
     # Join all category groups with AND
     where_clause = " AND ".join(where_clauses)
-    query = f"SELECT id, image_url, image_path, album_title, tags_json, album_url, colors_json FROM products WHERE {where_clause};"
-    
-    cursor.execute(query, all_params)
-    rows = cursor.fetchall()
-    conn.close()
-    
+    query = f"SELECT id, image_url, image_path, album_title, tags_json, album_url, colors_json FROM products WHERE {where_clause}"
+
+    # Sort by color percentage relevance if specified
+    # Score = sum of percentages for all selected colors (highest first)
+    if sort_by_colors:
+        debug_print(f"Sorting by color relevance for: {sort_by_colors}")
+        score_terms = []
+        for color in sort_by_colors:
+            score_terms.append("COALESCE(json_extract(NULLIF(colors_json, ''), ?), 0)")
+            all_params.append('$."{}"'.format(color.lower().replace('"', '\\"')))
+        query += f" ORDER BY ({' + '.join(score_terms)}) DESC, id"
+
+    cursor.execute(query + ";", all_params)
+
+    # Decode rows as SQLite produces them rather than materialising them all first
     results = []
-    for row in rows:
+    for row in cursor:
         product_id, image_url, image_path, album_title, tags_json, album_url, colors_json = row
-        tags = json.loads(tags_json)
-        colors_data = json.loads(colors_json) if colors_json else {}
+        tags = orjson.loads(tags_json)
+        colors_data = orjson.loads(colors_json) if colors_json else {}
         results.append((product_id, image_url, image_path, album_title, tags, album_url, colors_data))
-    
-    # Post-query filtering for exclusive type search
+    conn.close()
+
     if exclusive_type_search and "type" in tag_categories:
-        debug_print("Applying exclusive type search filter.")
-        requested_type_tags = [t for t in tag_categories["type"] if t.startswith("type_")]
-        
-        filtered_results = []
-        for product_tuple in results:
-            product_tags = product_tuple[4] # Index 4 is the tags list
-            product_type_tags = [t for t in product_tags if t.startswith("type_")]
-            
-            # Check if all product_type_tags are in requested_type_tags AND
-            # if the number of product_type_tags matches the number of requested_type_tags
-            # (i.e., no extra type tags present)
-            if all(t in requested_type_tags for t in product_type_tags) and \
-               len(product_type_tags) == len(requested_type_tags):
-                filtered_results.append(product_tuple)
-        results = filtered_results
         debug_print(f"Exclusive type search reduced results to {len(results)} products.")
 
-    # Sort by color percentage relevance if specified
-    if sort_by_colors and len(sort_by_colors) > 0 and results:
-        debug_print(f"Sorting by color relevance for: {sort_by_colors}")
-        
-        # Calculate relevance score for each product
-        # Score = sum of percentages for all selected colors
-        scored_results = []
-        for product_tuple in results:
-            colors_data = product_tuple[6]  # Index 6 is colors_data
-            
-            # Calculate total percentage of selected colors
-            relevance_score = sum(colors_data.get(color.lower(), 0.0) for color in sort_by_colors)
-            
-            scored_results.append((product_tuple, relevance_score))
-        
-        # Sort by relevance score (highest percentage first)
-        scored_results.sort(key=lambda x: x[1], reverse=True)
-        
-        # Extract just the product tuples (without scores)
-        results = [product_tuple for product_tuple, score in scored_results]
-        
-        debug_print(f"Top 5 scores: {[score for _, score in scored_results[:5]]}")
-    
     return results
 
 
@@ -374,20 +413,22 @@ def list_all_products(db_path: str = DB_NAME) -> List[Tuple[int, str, str, str,
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     cursor.execute("SELECT id, image_url, image_path, album_title, tags_json, album_url, colors_json FROM products;")
-    rows = cursor.fetchall()
-    conn.close()
     result: List[Tuple[int, str, str, str, List[str], str, dict]] = []
-    for row in rows:
+    for row in cursor:
         product_id, image_url, image_path, album_title, tags_json, album_url, colors_json = row
-        tags = json.loads(tags_json)
-        colors_data = json.loads(colors_json) if colors_json else {}
+        tags = orjson.loads(tags_json)
+        colors_data = orjson.loads(colors_json) if colors_json else {}
         result.append((product_id, image_url, image_path, album_title, tags, album_url, colors_data))
+    conn.close()
     return result
 
 
 def get_all_unique_tags(db_path: str = DB_NAME) -> List[str]:
     """Get all unique tags from all products in the database.
 
+    SQLite walks each tag array with `json_each` and de-duplicates the
+    values itself, so the per-product tag lists are never built in Python.
+
     Args:
         db_path: Path to the SQLite database file.
 
@@ -397,21 +438,60 @@ def get_all_unique_tags(db_path: str = DB_NAME) -> List[str]:
     debug_print("Fetching all unique tags from database...")
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
-    cursor.execute("SELECT tags_json FROM products;")
+    cursor.execute(
+        """
+        SELECT DISTINCT json_each.value
+        FROM products, json_each(products.tags_json)
+        ORDER BY json_each.value;
+        """
+    )
     rows = cursor.fetchall()
     conn.close()
     
-    all_tags = set()
-    for row in rows:
-        tags_json = row[0]
-        tags = json.loads(tags_json)
-        all_tags.update(tags)
-    
-    sorted_tags = sorted(list(all_tags))
+    sorted_tags = [row[0] for row in rows]
     debug_print(f"Found {len(sorted_tags)} unique tags")
     return sorted_tags
 
 
+def delete_untagged_products(db_path: str = DB_NAME) -> int:
+    """Delete products that have neither a company tag nor a type tag.
+
+    Untagged rows are found through the `has_core_tag` generated column
+    and its partial index, so only those rows are visited. Databases
+    whose SQLite build lacks generated columns fall back to the same
+    substring test on the raw `tags_json` text.
+
+    Args:
+        db_path: Path to the SQLite database file.
+
+    Returns:
+        The number of products that were deleted.
+    """
+    conn = sqlite3.connect(db_path)
+    _apply_bulk_write_pragmas(conn)
+    cursor = conn.cursor()
+    try:
+        start_changes = conn.total_changes
+        try:
+            cursor.execute("DELETE FROM products WHERE has_core_tag = 0;")
+        except sqlite3.OperationalError as e:
+            debug_print(f"has_core_tag unavailable ({e}), falling back to substring match")
+            cursor.execute(
+                """
+                DELETE FROM products
+                WHERE tags_json NOT GLOB '*"company_*'
+                  AND tags_json NOT GLOB '*"type_*';
+                """
+            )
+        # total_changes counts rows touched on this connection, so the delta
+        # is exact whichever DELETE ran and needs no per-row bookkeeping
+        deleted_count = conn.total_changes - start_changes
+        conn.commit()
+        return deleted_count
+    finally:
+        conn.close()
+
+
 def clear_database(db_path: str = DB_NAME) -> int:
     """Clear all products from the database and recreate with fresh schema.
 
@@ -439,11 +519,14 @@ def clear_database(db_path: str = DB_NAME) -> int:
     except Exception as e:
         debug_print(f"  Note: Could not count products: {e}")
     
-    # Delete the database file completely
+    # Delete the database file completely, along with any WAL side files
     try:
         if os.path.exists(db_path):
             os.remove(db_path)
             debug_print(f"  Deleted database file: {db_path}")
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
     except Exception as e:
         debug_print(f"  ERROR deleting database file: {e}")
         raise
@@ -454,17 +537,21 @@ def clear_database(db_path: str = DB_NAME) -> int:
     return deleted_rows
 
 
-def update_product_colors(product_id: int, new_colors_data: dict, db_path: str = DB_NAME) -> None:
+def update_product_colors(product_id: int, new_colors_data: dict, db_path: str = DB_NAME, conn: Optional[sqlite3.Connection] = None) -> None:
     """Update the colors_json for a specific product.
 
     Args:
         product_id: The ID of the product to update.
         new_colors_data: A dictionary with the new color names and percentages.
         db_path: Path to the SQLite database file.
+        conn: Optional open connection to reuse. The caller is then
+            responsible for committing and closing it.
     """
     debug_print(f"Updating colors for product ID: {product_id}")
     colors_json = json.dumps(new_colors_data)
-    conn = sqlite3.connect(db_path)
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     try:
         cursor.execute(
@@ -475,25 +562,31 @@ def update_product_colors(product_id: int, new_colors_data: dict, db_path: str =
             """,
             (colors_json, product_id),
         )
-        conn.commit()
+        if own_conn:
+            conn.commit()
         debug_print(f"Successfully updated colors for product ID: {product_id}")
     except Exception as e:
         debug_print(f"ERROR updating colors for product ID {product_id}: {e}")
         raise
     finally:
-        conn.close()
+        if own_conn:
+            conn.close()
 
 
-def update_product_tags(product_id: int, new_tags_json: str, db_path: str = DB_NAME) -> None:
+def update_product_tags(product_id: int, new_tags_json: str, db_path: str = DB_NAME, conn: Optional[sqlite3.Connection] = None) -> None:
     """Update the tags_json for a specific product.
 
     Args:
         product_id: The ID of the product to update.
         new_tags_json: A JSON string with the new tags.
         db_path: Path to the SQLite database file.
+        conn: Optional open connection to reuse. The caller is then
+            responsible for committing and closing it.
     """
     debug_print(f"Updating tags for product ID: {product_id}")
-    conn = sqlite3.connect(db_path)
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     try:
         cursor.execute(
@@ -504,13 +597,15 @@ def update_product_tags(product_id: int, new_tags_json: str, db_path: str = DB_N
             """,
             (new_tags_json, product_id),
         )
-        conn.commit()
+        if own_conn:
+            conn.commit()
         debug_print(f"Successfully updated tags for product ID: {product_id}")
     except Exception as e:
         debug_print(f"ERROR updating tags for product ID {product_id}: {e}")
         raise
     finally:
-        conn.close()
+        if own_conn:
+            conn.close()
 
 
 def adjust_color_percentages(db_path: str = DB_NAME, colors_to_adjust: Optional[List[str]] = None) -> dict:
@@ -570,101 +665,109 @@ def adjust_color_percentages(db_path: str = DB_NAME, colors_to_adjust: Optional[
         return {"average_percentages": average_percentages, "products_updated": 0, "message": "No specified colors found in any product."}
 
     # Second pass: Adjust specified color percentages and re-normalize other colors
-    for product_id, _, _, _, tags_list_original, album_url, colors_data_original in all_products:
-        original_colors = colors_data_original.copy()
+    # All updates share one connection (and one transaction) so sqlite3's
+    # statement cache compiles each UPDATE once instead of once per product
+    conn = sqlite3.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE)
+    _apply_bulk_write_pragmas(conn)
+    try:
+        for product_id, _, _, _, tags_list_original, album_url, colors_data_original in all_products:
+            original_colors = colors_data_original.copy()
         
-        product_changed = False
-        new_colors_data = {} # Starts empty with only colors_to_adjust added first
+            product_changed = False
+            new_colors_data = {} # Starts empty with only colors_to_adjust added first
 
-        tags_modified = False # Flag to track if tags_json needs updating
-        current_tags_list = tags_list_original.copy() # Work on a copy of the list
+            tags_modified = False # Flag to track if tags_json needs updating
+            current_tags_list = tags_list_original.copy() # Work on a copy of the list
         
-        # Collect all keys that will be adjusted (e.g., 'grey', 'gray', 'white')
-        keys_to_adjust_in_this_product = []
-        for target_color_name in colors_to_adjust:
-            # Check for primary key and its variations
-            color_keys_in_product = []
-            if target_color_name in original_colors:
-                color_keys_in_product.append(target_color_name)
-            if target_color_name == 'grey' and 'gray' in original_colors and 'gray' not in color_keys_in_product:
-                color_keys_in_product.append('gray')
-
-            for key in color_keys_in_product:
-                old_value = original_colors.get(key, 0.0)
-                average_value = average_percentages.get(target_color_name, 0.0) # Use the average for the conceptual color
+            # Collect all keys that will be adjusted (e.g., 'grey', 'gray', 'white')
+            keys_to_adjust_in_this_product = []
+            for target_color_name in colors_to_adjust:
+                # Check for primary key and its variations
+                color_keys_in_product = []
+                if target_color_name in original_colors:
+                    color_keys_in_product.append(target_color_name)
+                if target_color_name == 'grey' and 'gray' in original_colors and 'gray' not in color_keys_in_product:
+                    color_keys_in_product.append('gray')
+
+                for key in color_keys_in_product:
+                    old_value = original_colors.get(key, 0.0)
+                    average_value = average_percentages.get(target_color_name, 0.0) # Use the average for the conceptual color
                 
-                if abs(old_value - average_value) < 0.01: # Avoid unnecessary updates if very close
-                    new_colors_data[key] = old_value # Keep original value if not changing much
-                    debug_print(f"Product {product_id}: {key} percentage already close to average ({old_value:.2f}%). Skipping update for this color.")
-                    continue
+                    if abs(old_value - average_value) < 0.01: # Avoid unnecessary updates if very close
+                        new_colors_data[key] = old_value # Keep original value if not changing much
+                        debug_print(f"Product {product_id}: {key} percentage already close to average ({old_value:.2f}%). Skipping update for this color.")
+                        continue
                 
-                product_changed = True # Mark product for update
-                adjusted_value = old_value - average_value
+                    product_changed = True # Mark product for update
+                    adjusted_value = old_value - average_value
                 
-                EPSILON = 1e-9 # Define a small epsilon for floating point comparisons
-                if adjusted_value > EPSILON:
-                    new_colors_data[key] = adjusted_value
-                    debug_print(f"  Product {product_id}: Adjusted {key} from {old_value:.2f}% to {adjusted_value:.2f}% (Avg {target_color_name} Subtracted: {average_value:.2f}%). New value: {adjusted_value:.2f}%")
-                else:
-                    debug_print(f"  Product {product_id}: {key} percentage {old_value:.2f}% is <= average ({average_value:.2f}%). Adjusted value ({adjusted_value:.2f}%) is <= EPSILON. Removing {key} from colors_json AND tags_json.")
-                    # The key is implicitly removed from new_colors_data as it's not added if <= EPSILON.
-
-                    # --- LOGIC FOR tags_json removal ---
-                    tag_to_remove = f"color_{key}"
-                    if tag_to_remove in current_tags_list:
-                        current_tags_list.remove(tag_to_remove)
-                        tags_modified = True
-                    # --- END LOGIC ---
+                    EPSILON = 1e-9 # Define a small epsilon for floating point comparisons
+                    if adjusted_value > EPSILON:
+                        new_colors_data[key] = adjusted_value
+                        debug_print(f"  Product {product_id}: Adjusted {key} from {old_value:.2f}% to {adjusted_value:.2f}% (Avg {target_color_name} Subtracted: {average_value:.2f}%). New value: {adjusted_value:.2f}%")
+                    else:
+                        debug_print(f"  Product {product_id}: {key} percentage {old_value:.2f}% is <= average ({average_value:.2f}%). Adjusted value ({adjusted_value:.2f}%) is <= EPSILON. Removing {key} from colors_json AND tags_json.")
+                        # The key is implicitly removed from new_colors_data as it's not added if <= EPSILON.
+
+                        # --- LOGIC FOR tags_json removal ---
+                        tag_to_remove = f"color_{key}"
+                        if tag_to_remove in current_tags_list:
+                            current_tags_list.remove(tag_to_remove)
+                            tags_modified = True
+                        # --- END LOGIC ---
                 
-                keys_to_adjust_in_this_product.append(key)
+                    keys_to_adjust_in_this_product.append(key)
         
-        if not product_changed:
-            debug_print(f"Product {product_id}: No specified colors found or values not significantly different. Skipping adjustment.")
-            continue
+            if not product_changed:
+                debug_print(f"Product {product_id}: No specified colors found or values not significantly different. Skipping adjustment.")
+                continue
         
-        new_tags_json_to_save = json.dumps(current_tags_list) if tags_modified else json.dumps(tags_list_original)
+            new_tags_json_to_save = json.dumps(current_tags_list) if tags_modified else json.dumps(tags_list_original)
 
-        # Calculate total percentage of other colors before adjustment
-        total_other_colors_original = sum(v for k, v in original_colors.items() if k not in keys_to_adjust_in_this_product)
+            # Calculate total percentage of other colors before adjustment
+            total_other_colors_original = sum(v for k, v in original_colors.items() if k not in keys_to_adjust_in_this_product)
 
-        # Determine the target sum for other colors after adjustment
-        current_adjusted_sum_of_special_colors = sum(new_colors_data.values())
-        target_sum_other_colors = 100.0 - current_adjusted_sum_of_special_colors
+            # Determine the target sum for other colors after adjustment
+            current_adjusted_sum_of_special_colors = sum(new_colors_data.values())
+            target_sum_other_colors = 100.0 - current_adjusted_sum_of_special_colors
         
-        # Ensure target_sum_other_colors is not negative
-        if target_sum_other_colors < 0:
-            target_sum_other_colors = 0
+            # Ensure target_sum_other_colors is not negative
+            if target_sum_other_colors < 0:
+                target_sum_other_colors = 0
 
-        if total_other_colors_original > 0:
-            # Calculate scaling factor for other colors
-            scaling_factor = target_sum_other_colors / total_other_colors_original
+            if total_other_colors_original > 0:
+                # Calculate scaling factor for other colors
+                scaling_factor = target_sum_other_colors / total_other_colors_original
             
-            # Apply scaling factor to other colors
-            for color, percentage in original_colors.items():
-                if color not in keys_to_adjust_in_this_product:
-                    new_colors_data[color] = percentage * scaling_factor
-        else:
-            # If there were no other colors, or they summed to zero,
-            # then all other colors should now be 0.
-            for color, percentage in original_colors.items():
-                if color not in keys_to_adjust_in_this_product:
-                    new_colors_data[color] = 0.0 # Explicitly set others to 0
-
-        # Ensure sum is 100 (due to potential float precision issues)
-        current_sum = sum(new_colors_data.values())
-        if abs(current_sum - 100.0) > 0.01:
-            debug_print(f"  Warning: Sum of percentages for product {product_id} is {current_sum:.2f} after adjustment. Renormalizing slightly.")
-            re_scaling_factor = 100.0 / current_sum
-            for color in new_colors_data:
-                new_colors_data[color] *= re_scaling_factor
-
-        # Update the database
-        debug_print(f"  Adjusting color percentages: Calling update_product_colors for product ID: {product_id}. new_colors_data (type={type(new_colors_data)}): {new_colors_data}")
-        update_product_colors(product_id, new_colors_data, db_path)
-        if tags_modified:
-            debug_print(f"  Adjusting color percentages: Calling update_product_tags for product ID: {product_id}. new_tags_json_to_save (type={type(new_tags_json_to_save)}): {new_tags_json_to_save}")
-            update_product_tags(product_id, new_tags_json_to_save, db_path) # Updates tags_json
-        updated_product_count += 1
+                # Apply scaling factor to other colors
+                for color, percentage in original_colors.items():
+                    if color not in keys_to_adjust_in_this_product:
+                        new_colors_data[color] = percentage * scaling_factor
+            else:
+                # If there were no other colors, or they summed to zero,
+                # then all other colors should now be 0.
+                for color, percentage in original_colors.items():
+                    if color not in keys_to_adjust_in_this_product:
+                        new_colors_data[color] = 0.0 # Explicitly set others to 0
+
+            # Ensure sum is 100 (due to potential float precision issues)
+            current_sum = sum(new_colors_data.values())
+            if abs(current_sum - 100.0) > 0.01:
+                debug_print(f"  Warning: Sum of percentages for product {product_id} is {current_sum:.2f} after adjustment. Renormalizing slightly.")
+                re_scaling_factor = 100.0 / current_sum
+                for color in new_colors_data:
+                    new_colors_data[color] *= re_scaling_factor
+
+            # Update the database
+            debug_print(f"  Adjusting color percentages: Calling update_product_colors for product ID: {product_id}. new_colors_data (type={type(new_colors_data)}): {new_colors_data}")
+            update_product_colors(product_id, new_colors_data, db_path, conn=conn)
+            if tags_modified:
+                debug_print(f"  Adjusting color percentages: Calling update_product_tags for product ID: {product_id}. new_tags_json_to_save (type={type(new_tags_json_to_save)}): {new_tags_json_to_save}")
+                update_product_tags(product_id, new_tags_json_to_save, db_path, conn=conn) # Updates tags_json
+            updated_product_count += 1
+        conn.commit()
+    finally:
+        conn.close()
 
     debug_print(f"Finished color percentage adjustment. Updated {updated_product_count} products.")
     return {
@@ -1024,14 +1127,13 @@ def get_all_product_images(db_path: str = DB_NAME) -> List[Tuple[int, str, str,
     cursor.execute(
         "SELECT id, image_url, album_title, tags_json FROM products;"
     )
-    rows = cursor.fetchall()
-    conn.close()
-    # Parse tags_json for each row
+    # Parse tags_json for each row as it is read
     result = []
-    for row in rows:
+    for row in cursor:
         product_id, image_url, album_title, tags_json = row
-        existing_tags = json.loads(tags_json) if tags_json else []
+        existing_tags = orjson.loads(tags_json) if tags_json else []
         result.append((product_id, image_url, album_title, existing_tags))
+    conn.close()
     return result
 
 
@@ -1069,6 +1171,45 @@ def update_product_tags_and_colors(product_id: int, tags: Iterable[str], colors_
         conn.close()
 
 
+def update_products_tags_and_colors_batch(updates: Iterable[Tuple[int, Iterable[str], Optional[dict]]], db_path: str = DB_NAME) -> int:
+    """Update the tags and colors for many products in a single transaction.
+    
+    Args:
+        updates: Iterable of (product_id, tags, colors_data) tuples
+        db_path: Path to the SQLite database file
+        
+    Returns:
+        The number of products that were updated
+    """
+    params = [
+        (json.dumps(list(tags)), json.dumps(colors_data or {}), product_id)
+        for product_id, tags, colors_data in updates
+    ]
+    if not params:
+        return 0
+    
+    conn = sqlite3.connect(db_path)
+    _apply_bulk_write_pragmas(conn)
+    cursor = conn.cursor()
+    try:
+        cursor.executemany(
+            """
+            UPDATE products
+            SET tags_json = ?, colors_json = ?
+            WHERE id = ?;
+            """,
+            params,
+        )
+        conn.commit()
+        debug_print(f"Updated {cursor.rowcount} products with new tags and colors")
+        return cursor.rowcount
+    except Exception as e:
+        debug_print(f"ERROR updating batch of {len(params)} products: {e}")
+        raise
+    finally:
+        conn.close()
+
+
 def rgb_to_lab(rgb: Tuple[float, float, float]) -> Tuple[float, float, float]:
     """Convert RGB to LAB color space for better perceptual color distance calculations.
     
@@ -1217,12 +1358,17 @@ def find_similar_products_by_color(product_id: int, limit: int = 50, same_brand:
         return []
     
     ref_id, ref_image_url, ref_image_path, ref_album_title, ref_tags_json, ref_album_url, ref_colors_json = reference_row
-    ref_tags = json.loads(ref_tags_json)
-    ref_colors = json.loads(ref_colors_json) if ref_colors_json else {}
+    ref_tags = orjson.loads(ref_tags_json)
+    ref_colors = orjson.loads(ref_colors_json) if ref_colors_json else {}
     
     # Extract type tags and brand tags from reference product
-    ref_type_tags = [tag for tag in ref_tags if tag.startswith('type_')]
-    ref_brand_tags = [tag for tag in ref_tags if tag.startswith('company_')]
+    ref_type_tags = []
+    ref_brand_tags = []
+    for tag in ref_tags:
+        if tag.startswith('type_'):
+            ref_type_tags.append(tag)
+        elif tag.startswith('company_'):
+            ref_brand_tags.append(tag)
     
     debug_print(f"Finding similar products for product {product_id}")
     debug_print(f"  Reference colors: {ref_colors}")
@@ -1267,17 +1413,13 @@ def find_similar_products_by_color(product_id: int, limit: int = 50, same_brand:
         """
     
     cursor.execute(query, params)
-    candidate_rows = cursor.fetchall()
-    conn.close()
     
-    debug_print(f"  Found {len(candidate_rows)} candidate products with matching type tags")
-    
-    # Calculate similarity scores for each candidate
+    # Calculate similarity scores for each candidate as rows are read
     results = []
-    for row in candidate_rows:
+    for row in cursor:
         cand_id, cand_image_url, cand_image_path, cand_album_title, cand_tags_json, cand_album_url, cand_colors_json = row
-        cand_tags = json.loads(cand_tags_json)
-        cand_colors = json.loads(cand_colors_json) if cand_colors_json else {}
+        cand_tags = orjson.loads(cand_tags_json)
+        cand_colors = orjson.loads(cand_colors_json) if cand_colors_json else {}
         
         # Calculate color similarity score
         similarity_score = calculate_color_similarity(ref_colors, cand_colors)
@@ -1292,6 +1434,9 @@ def find_similar_products_by_color(product_id: int, limit: int = 50, same_brand:
             cand_colors,
             similarity_score
         ))
+    conn.close()
+    
+    debug_print(f"  Found {len(results)} candidate products with matching type tags")
     
     # Sort by similarity score (lower is more similar)
     results.sort(key=lambda x: x[7])
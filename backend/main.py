@@ -14,14 +14,19 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import sys
-import json
+import orjson
+import asyncio
+import multiprocessing
 import os
-import requests
+import queue
 import hashlib
+from contextlib import asynccontextmanager
 from PIL import Image
 from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import chain
 
 from . import database
 from . import scraper
@@ -46,7 +51,16 @@ def debug_print(message: str):
 # Initialise the database when the module is imported
 database.init_db()
 
-app = FastAPI(title="Yupoo Product Scraper", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release the scrape workers when the server shuts down."""
+    yield
+    # Waiting for the scrape workers to exit must not block the event loop
+    await asyncio.to_thread(_shutdown_scrape_pool)
+
+
+app = FastAPI(title="Yupoo Product Scraper", version="1.0.0", lifespan=lifespan)
 
 @app.middleware("http")
 async def add_private_network_header(request: Request, call_next):
@@ -134,19 +148,34 @@ def api_health_check():
     return {"status": "ok", "message": "API is running"}
 
 
-def save_image_locally(image_url: str) -> Optional[str]:
+def download_image(image_url: str) -> bytes:
+    """Download an image and return its encoded bytes.
+    
+    Args:
+        image_url: URL of the image to download
+        
+    Returns:
+        The response body
+    """
+    # The shared session already carries the scraper's browser headers
+    response = scraper.get_session().get(image_url, timeout=10)
+    response.raise_for_status()
+    return response.content
+
+
+def save_image_locally(image_url: str, image_bytes: Optional[bytes] = None) -> Optional[str]:
     """Download and save an image locally.
     
     Args:
         image_url: URL of the image to download
+        image_bytes: Already downloaded image bytes; fetched from `image_url` if omitted
         
     Returns:
         Local path to the saved image, or None if failed
     """
     try:
-        headers = scraper.get_headers()
-        response = requests.get(image_url, timeout=10, headers=headers)
-        response.raise_for_status()
+        if image_bytes is None:
+            image_bytes = download_image(image_url)
         
         # Create filename from URL hash
         url_hash = hashlib.md5(image_url.encode()).hexdigest()
@@ -155,7 +184,7 @@ def save_image_locally(image_url: str) -> Optional[str]:
         
         # Save the image
         with open(filepath, 'wb') as f:
-            f.write(response.content)
+            f.write(image_bytes)
         
         debug_print(f"Saved image to: {filepath}")
         return f"/api/images/{filename}"
@@ -404,8 +433,8 @@ def get_list_products(list_id: int, current_user: dict = Depends(auth.get_curren
         
         if product_row:
             pid, image_url, image_path, album_title, tags_json, album_url, colors_json = product_row
-            tags = json.loads(tags_json)
-            colors = json.loads(colors_json) if colors_json else {}
+            tags = orjson.loads(tags_json)
+            colors = orjson.loads(colors_json) if colors_json else {}
             
             result.append({
                 "saved_product_id": saved_id,
@@ -463,16 +492,25 @@ def remove_product(list_id: int, product_id: int, current_user: dict = Depends(a
 
 
 @app.get("/api/user/products/{product_id}/saved-status", summary="Check if product is saved")
-def check_saved_status(product_id: int, current_user: Optional[dict] = Depends(auth.get_current_user_optional)):
+def check_saved_status(product_id: int, request: Request):
     """Check which lists contain a product.
     
+    This endpoint is called once per product card, so the Authorization
+    header is inspected directly: anonymous requests return immediately
+    without resolving the optional-auth dependency.
+    
     Args:
         product_id: The product ID
-        current_user: The authenticated user (optional)
+        request: The incoming request (used to read the Authorization header)
         
     Returns:
         List names that contain this product
     """
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return {"lists": []}
+    
+    current_user = auth.get_user_from_authorization_header(authorization)
     if not current_user:
         return {"lists": []}
     
@@ -482,10 +520,279 @@ def check_saved_status(product_id: int, current_user: Optional[dict] = Depends(a
 
 # ========== Scraper Endpoints (Admin Protected) ==========
 
+# Cover images downloaded, saved and tagged concurrently during a scrape
+SCRAPE_COVER_WORKERS = vision.TAGGING_WORKERS
+
+
+def _prepare_scraped_cover(job: Tuple[str, str]) -> Tuple[Optional[str], object]:
+    """Download a scraped cover once, save it locally and tag it from the same bytes.
+
+    Args:
+        job: (image_url, album_title) pair.
+
+    Returns:
+        A tuple of (local_image_path, tag_result). The path is None if the
+        image could not be downloaded or saved; tag_result is the
+        `(tags, color_data)` tuple from vision, or the exception it raised.
+    """
+    img_url, album_title = job
+    try:
+        image_bytes = download_image(img_url)
+    except Exception as exc:
+        debug_print(f"Failed to download image from {img_url}: {exc}")
+        return None, exc
+    
+    local_image_path = save_image_locally(img_url, image_bytes)
+    if not local_image_path:
+        return None, None
+    try:
+        return local_image_path, vision.generate_tags_for_image_from_bytes(image_bytes, album_title, source=img_url)
+    except Exception as exc:
+        return local_image_path, exc
+
+
+def scrape_generator(base_url: str, max_albums: int):
+    """Run a full scrape and yield Server-Sent Event lines describing its progress.
+
+    Args:
+        base_url: The Yupoo base URL to scrape.
+        max_albums: Maximum number of albums to fetch.
+
+    Yields:
+        `data: ...` SSE lines with progress updates and the final result.
+    """
+    debug_print("Calling scraper.get_album_links_and_covers...")
+    
+    # Collect all progress updates from scraper generator
+    scraper_gen = scraper.get_album_links_and_covers(base_url, max_albums=max_albums)
+    pairs = None
+    
+    for scraper_update in scraper_gen:
+        # Relay scraper progress updates to client
+        if scraper_update["type"] == "scanning_pages":
+            yield f"data: {orjson.dumps({'type': 'info', 'message': scraper_update['message']}).decode()}\n\n"
+        elif scraper_update["type"] == "page_scanned":
+            yield f"data: {orjson.dumps({'type': 'page_scanned', 'page': scraper_update['page'], 'albums_found': scraper_update['albums_found']}).decode()}\n\n"
+        elif scraper_update["type"] == "scan_complete":
+            yield f"data: {orjson.dumps({'type': 'scan_complete', 'total_albums': scraper_update['total_albums'], 'will_fetch': scraper_update['will_fetch']}).decode()}\n\n"
+        elif scraper_update["type"] == "scrape_start":
+            yield f"data: {orjson.dumps({'type': 'info', 'message': scraper_update['message']}).decode()}\n\n"
+        elif scraper_update["type"] == "fetching_page":
+            yield f"data: {orjson.dumps({'type': 'fetching_page', 'page': scraper_update['page']}).decode()}\n\n"
+        elif scraper_update["type"] == "page_albums_found":
+            msg = f"Found {scraper_update['albums_on_page']} albums on page {scraper_update['page']}"
+            yield f"data: {orjson.dumps({'type': 'info', 'message': msg}).decode()}\n\n"
+        elif scraper_update["type"] == "album_scanning":
+            yield f"data: {orjson.dumps({'type': 'album_scanning', 'album_number': scraper_update['album_number'], 'max': scraper_update['max_albums'], 'url': scraper_update['album_url']}).decode()}\n\n"
+        elif scraper_update["type"] == "album_success":
+            yield f"data: {orjson.dumps({'type': 'album_found', 'album_number': scraper_update['album_number'], 'title': scraper_update['album_title'], 'tags': scraper_update['clothing_tags']}).decode()}\n\n"
+        elif scraper_update["type"] == "scrape_complete":
+            pairs = scraper_update["albums"]
+            debug_print(f"Scraper returned {len(pairs)} album pairs")
+            yield f"data: {orjson.dumps({'type': 'info', 'message': f'Found {len(pairs)} albums to process'}).decode()}\n\n"
+    
+    if pairs is None:
+        pairs = []
+    
+    inserted = 0
+    failed = 0
+    
+    # Download, save and tag cover images in parallel ahead of the loop;
+    # results arrive in album order
+    with ThreadPoolExecutor(max_workers=SCRAPE_COVER_WORKERS) as cover_executor:
+        covers = cover_executor.map(_prepare_scraped_cover, [(img_url, album_title) for _, img_url, album_title, _ in pairs])
+        
+        try:
+            for idx, ((album_url, img_url, album_title, clothing_tags), (local_image_path, tag_result)) in enumerate(zip(pairs, covers), 1):
+                debug_print(f"\nProcessing album {idx}/{len(pairs)}")
+                debug_print(f"  Title: {album_title}")
+                debug_print(f"  Clothing tags detected: {clothing_tags}")
+                
+                # Yield progress update
+                progress_data = {
+                    "type": "progress",
+                    "current": idx,
+                    "total": len(pairs),
+                    "album_url": album_url,
+                    "message": f"Processing album {idx}/{len(pairs)}"
+                }
+                yield f"data: {orjson.dumps(progress_data).decode()}\n\n"
+                
+                # Image was saved locally by _prepare_scraped_cover
+                if not local_image_path:
+                    debug_print(f"  Failed to save image")
+                    failed += 1
+                    yield f"data: {orjson.dumps({'type': 'error', 'message': f'Failed to save image from {album_url}'}).decode()}\n\n"
+                    continue
+                debug_print(f"  Image saved to: {local_image_path}")
+                
+                # Generate tags for the cover image (including color and company tags)
+                try:
+                    debug_print(f"  Generating tags for image...")
+                    if isinstance(tag_result, Exception):
+                        raise tag_result
+                    vision_tags, color_data = tag_result
+                    debug_print(f"  Vision tags generated: {vision_tags}")
+                    debug_print(f"  Color data: {color_data}")
+                
+                    # Merge clothing tags with vision tags
+                    all_tags = list(set(clothing_tags + vision_tags))  # Remove duplicates
+                    debug_print(f"  All tags (clothing + vision): {all_tags}")
+                except Exception as exc:
+                    # Skip problematic images
+                    debug_print(f"  ERROR generating tags for {img_url}: {exc}")
+                    failed += 1
+                    yield f"data: {orjson.dumps({'type': 'error', 'message': f'Failed to generate tags for {album_url}'}).decode()}\n\n"
+                    continue
+                
+                # Insert into database with image path and album title
+                try:
+                    debug_print(f"  Inserting into database...")
+                    database.insert_product(img_url, all_tags, album_url, image_path=local_image_path, album_title=album_title, colors_data=color_data)
+                    inserted += 1
+                    debug_print(f"  Successfully inserted!")
+                    yield f"data: {orjson.dumps({'type': 'success', 'message': f'Inserted product from {album_url}'}).decode()}\n\n"
+                except Exception as exc:
+                    debug_print(f"  ERROR inserting into database: {exc}")
+                    failed += 1
+                    yield f"data: {orjson.dumps({'type': 'error', 'message': f'Failed to insert product from {album_url}'}).decode()}\n\n"
+
+        finally:
+            # Drop covers not started yet when the scrape is stopped early
+            cover_executor.shutdown(cancel_futures=True)    
+    debug_print(f"\n=== SCRAPE REQUEST COMPLETE ===")
+    debug_print(f"Albums processed: {len(pairs)}")
+    debug_print(f"Products inserted: {inserted}")
+    debug_print(f"Failed: {failed}")
+    
+    # Yield final result
+    yield f"data: {orjson.dumps({'type': 'complete', 'albums_processed': len(pairs), 'products_inserted': inserted, 'failed': failed}).decode()}\n\n"
+
+
+def _put_event(events, cancelled, event: Optional[str]) -> bool:
+    """Put `event` on a bounded event queue, giving up once the job is cancelled.
+
+    Returns:
+        True if the event was queued, False if the job was cancelled first.
+    """
+    while not cancelled.is_set():
+        try:
+            events.put(event, timeout=SCRAPE_RELAY_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _run_scrape_job(base_url: str, max_albums: int, events, cancelled) -> None:
+    """Drain `scrape_generator` into a queue (runs inside the scrape process pool).
+
+    The job stops at its next event once `cancelled` is set, e.g. because the
+    client disconnected or the server is shutting down. A `None` sentinel is
+    put last, when there is room for it, so the relaying request knows the
+    job has finished.
+    """
+    try:
+        for event in scrape_generator(base_url, max_albums):
+            if not _put_event(events, cancelled, event):
+                debug_print("Scrape job cancelled, stopping")
+                break
+    except Exception as exc:
+        debug_print(f"ERROR in scrape job: {exc}")
+        _put_event(events, cancelled, f"data: {orjson.dumps({'type': 'error', 'message': f'Scrape failed: {exc}'}).decode()}\n\n")
+    finally:
+        try:
+            events.put_nowait(None)
+        except queue.Full:
+            pass
+
+
+# Scrapes are long-running network + CPU (vision tagging) jobs, so they run in a
+# dedicated process pool instead of occupying one of uvicorn's handler threads.
+# Both the pool and the queue manager are created lazily on the first scrape.
+SCRAPE_POOL_WORKERS = 2
+_scrape_pool: Optional[ProcessPoolExecutor] = None
+_scrape_manager = None
+
+# Threads that wait on scrape event queues for the SSE relays. Waits time out
+# every SCRAPE_RELAY_POLL_SECONDS, so more streams than threads take turns
+# and a closed stream frees its thread, without using the default executor.
+SCRAPE_RELAY_WORKERS = 8
+SCRAPE_RELAY_POLL_SECONDS = 1.0
+_relay_executor: Optional[ThreadPoolExecutor] = None
+
+# Events buffered per scrape before the job waits for its relay to catch up
+SCRAPE_EVENT_QUEUE_SIZE = 1000
+# Cancel flags of the scrapes still being relayed, set on server shutdown
+_scrape_cancel_events = set()
+
+
+# Upper bound on SSE events coalesced into one chunk of the response stream
+SCRAPE_EVENT_BATCH_SIZE = 50
+
+
+def _get_event_batch(events, max_events: int = SCRAPE_EVENT_BATCH_SIZE) -> List[Optional[str]]:
+    """Wait for the next scrape event, then drain whatever else is already queued.
+
+    Bursts of events (e.g. a page of albums finishing together) are relayed as
+    one chunk with one executor hop instead of one per event, while a lone
+    event is still sent immediately. The `None` sentinel ends a batch.
+
+    Args:
+        events: The job's event queue.
+        max_events: Maximum number of events to return at once.
+
+    Returns:
+        The queued SSE strings, possibly ending with the `None` sentinel.
+        Empty if nothing arrived within `SCRAPE_RELAY_POLL_SECONDS`.
+    """
+    try:
+        batch = [events.get(timeout=SCRAPE_RELAY_POLL_SECONDS)]
+    except queue.Empty:
+        return []
+    while batch[-1] is not None and len(batch) < max_events:
+        try:
+            batch.append(events.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _get_scrape_pool():
+    """Return the shared scrape process pool, queue manager and relay executor, creating them on first use."""
+    global _scrape_pool, _scrape_manager, _relay_executor
+    if _scrape_pool is None:
+        _scrape_manager = multiprocessing.Manager()
+        _scrape_pool = ProcessPoolExecutor(max_workers=SCRAPE_POOL_WORKERS)
+        _relay_executor = ThreadPoolExecutor(
+            max_workers=SCRAPE_RELAY_WORKERS, thread_name_prefix="scrape-relay"
+        )
+    return _scrape_pool, _scrape_manager, _relay_executor
+
+
+def _shutdown_scrape_pool() -> None:
+    """Stop the scrape process pool, queue manager and relay threads, if they were started."""
+    global _scrape_pool, _scrape_manager, _relay_executor
+    if _scrape_pool is None:
+        return
+    debug_print("Shutting down scrape pool")
+    # Queued scrapes are dropped and running ones stop at their next event;
+    # the manager goes last, as the jobs still use its queues and flags
+    for cancelled in list(_scrape_cancel_events):
+        cancelled.set()
+    _scrape_pool.shutdown(cancel_futures=True)
+    _relay_executor.shutdown(wait=False, cancel_futures=True)
+    _scrape_manager.shutdown()
+    _scrape_pool = _scrape_manager = _relay_executor = None
+
+
 @app.post("/api/scrape", summary="Scrape albums and extract tags")
-def scrape_endpoint(payload: ScrapeRequest, current_user: dict = Depends(auth.get_current_admin)):
+async def scrape_endpoint(payload: ScrapeRequest, current_user: dict = Depends(auth.get_current_admin)):
     """Scrape the specified Yupoo base URL and store products in the database.
 
+    The scrape itself runs in the scrape process pool; this handler only
+    relays the progress events it produces.
+
     Args:
         payload: A JSON body containing the base URL and optional max_albums.
 
@@ -499,112 +806,47 @@ def scrape_endpoint(payload: ScrapeRequest, current_user: dict = Depends(auth.ge
     debug_print(f"Base URL: {base_url}")
     debug_print(f"Max Albums: {max_albums}")
     
-    # Get album list and cover images with generator for progress
-    def scrape_generator():
-        debug_print("Calling scraper.get_album_links_and_covers...")
-        
-        # Collect all progress updates from scraper generator
-        scraper_gen = scraper.get_album_links_and_covers(base_url, max_albums=max_albums)
-        pairs = None
-        
-        for scraper_update in scraper_gen:
-            # Relay scraper progress updates to client
-            if scraper_update["type"] == "scanning_pages":
-                yield f"data: {json.dumps({'type': 'info', 'message': scraper_update['message']})}\n\n"
-            elif scraper_update["type"] == "page_scanned":
-                yield f"data: {json.dumps({'type': 'page_scanned', 'page': scraper_update['page'], 'albums_found': scraper_update['albums_found']})}\n\n"
-            elif scraper_update["type"] == "scan_complete":
-                yield f"data: {json.dumps({'type': 'scan_complete', 'total_albums': scraper_update['total_albums'], 'will_fetch': scraper_update['will_fetch']})}\n\n"
-            elif scraper_update["type"] == "scrape_start":
-                yield f"data: {json.dumps({'type': 'info', 'message': scraper_update['message']})}\n\n"
-            elif scraper_update["type"] == "fetching_page":
-                yield f"data: {json.dumps({'type': 'fetching_page', 'page': scraper_update['page']})}\n\n"
-            elif scraper_update["type"] == "page_albums_found":
-                msg = f"Found {scraper_update['albums_on_page']} albums on page {scraper_update['page']}"
-                yield f"data: {json.dumps({'type': 'info', 'message': msg})}\n\n"
-            elif scraper_update["type"] == "album_scanning":
-                yield f"data: {json.dumps({'type': 'album_scanning', 'album_number': scraper_update['album_number'], 'max': scraper_update['max_albums'], 'url': scraper_update['album_url']})}\n\n"
-            elif scraper_update["type"] == "album_success":
-                yield f"data: {json.dumps({'type': 'album_found', 'album_number': scraper_update['album_number'], 'title': scraper_update['album_title'], 'tags': scraper_update['clothing_tags']})}\n\n"
-            elif scraper_update["type"] == "scrape_complete":
-                pairs = scraper_update["albums"]
-                debug_print(f"Scraper returned {len(pairs)} album pairs")
-                yield f"data: {json.dumps({'type': 'info', 'message': f'Found {len(pairs)} albums to process'})}\n\n"
-        
-        if pairs is None:
-            pairs = []
-        
-        inserted = 0
-        failed = 0
-        
-        for idx, (album_url, img_url, album_title, clothing_tags) in enumerate(pairs, 1):
-            debug_print(f"\nProcessing album {idx}/{len(pairs)}")
-            debug_print(f"  Title: {album_title}")
-            debug_print(f"  Clothing tags detected: {clothing_tags}")
-            
-            # Yield progress update
-            progress_data = {
-                "type": "progress",
-                "current": idx,
-                "total": len(pairs),
-                "album_url": album_url,
-                "message": f"Processing album {idx}/{len(pairs)}"
-            }
-            yield f"data: {json.dumps(progress_data)}\n\n"
-            
-            # Save image locally
-            try:
-                debug_print(f"  Saving image locally...")
-                local_image_path = save_image_locally(img_url)
-                if not local_image_path:
-                    debug_print(f"  Failed to save image")
-                    failed += 1
-                    yield f"data: {json.dumps({'type': 'error', 'message': f'Failed to save image from {album_url}'})}\n\n"
-                    continue
-                debug_print(f"  Image saved to: {local_image_path}")
-            except Exception as exc:
-                debug_print(f"  ERROR saving image: {exc}")
-                failed += 1
-                continue
-            
-            # Generate tags for the cover image (including color and company tags)
-            try:
-                debug_print(f"  Generating tags for image...")
-                vision_tags, color_data = vision.generate_tags_for_image(img_url, album_title=album_title)
-                debug_print(f"  Vision tags generated: {vision_tags}")
-                debug_print(f"  Color data: {color_data}")
-                
-                # Merge clothing tags with vision tags
-                all_tags = list(set(clothing_tags + vision_tags))  # Remove duplicates
-                debug_print(f"  All tags (clothing + vision): {all_tags}")
-            except Exception as exc:
-                # Skip problematic images
-                debug_print(f"  ERROR generating tags for {img_url}: {exc}")
-                failed += 1
-                yield f"data: {json.dumps({'type': 'error', 'message': f'Failed to generate tags for {album_url}'})}\n\n"
-                continue
-            
-            # Insert into database with image path and album title
-            try:
-                debug_print(f"  Inserting into database...")
-                database.insert_product(img_url, all_tags, album_url, image_path=local_image_path, album_title=album_title, colors_data=color_data)
-                inserted += 1
-                debug_print(f"  Successfully inserted!")
-                yield f"data: {json.dumps({'type': 'success', 'message': f'Inserted product from {album_url}'})}\n\n"
-            except Exception as exc:
-                debug_print(f"  ERROR inserting into database: {exc}")
-                failed += 1
-                yield f"data: {json.dumps({'type': 'error', 'message': f'Failed to insert product from {album_url}'})}\n\n"
-        
-        debug_print(f"\n=== SCRAPE REQUEST COMPLETE ===")
-        debug_print(f"Albums processed: {len(pairs)}")
-        debug_print(f"Products inserted: {inserted}")
-        debug_print(f"Failed: {failed}")
-        
-        # Yield final result
-        yield f"data: {json.dumps({'type': 'complete', 'albums_processed': len(pairs), 'products_inserted': inserted, 'failed': failed})}\n\n"
+    pool, manager, relay_executor = _get_scrape_pool()
+    events = manager.Queue(maxsize=SCRAPE_EVENT_QUEUE_SIZE)
+    cancelled = manager.Event()
+    _scrape_cancel_events.add(cancelled)
+    job = pool.submit(_run_scrape_job, base_url, max_albums, events, cancelled)
+    
+    def on_job_done(future):
+        # The job puts its own sentinel; only cover failures to start it at all
+        if future.cancelled():
+            debug_print("Scrape job cancelled before it started")
+        elif future.exception() is not None:
+            debug_print(f"ERROR starting scrape job: {future.exception()}")
+        else:
+            return
+        try:
+            events.put_nowait(None)
+        except queue.Full:
+            pass
+    
+    job.add_done_callback(on_job_done)
     
-    return StreamingResponse(scrape_generator(), media_type="text/event-stream")
+    async def relay_events():
+        loop = asyncio.get_running_loop()
+        finished = False
+        try:
+            while not finished:
+                batch = await loop.run_in_executor(relay_executor, _get_event_batch, events)
+                finished = bool(batch) and batch[-1] is None
+                if finished:
+                    batch.pop()
+                if batch:
+                    yield "".join(batch)
+        finally:
+            _scrape_cancel_events.discard(cancelled)
+            if not finished and not job.done():
+                # The client went away; nobody will drain this job's events
+                debug_print("Scrape stream closed early, cancelling job")
+                job.cancel()
+                cancelled.set()
+    
+    return StreamingResponse(relay_events(), media_type="text/event-stream")
 
 
 @app.get("/api/tags", summary="Get all available tags")
@@ -803,36 +1045,7 @@ def clean_untagged_products(current_user: dict = Depends(auth.get_current_admin)
     debug_print(f"=== CLEAN UNTAGGED PRODUCTS REQUEST by {current_user['username']} ===")
     
     try:
-        conn = database.sqlite3.connect(database.DB_NAME)
-        cursor = conn.cursor()
-        
-        # Find products that don't have any company_ or type_ tags
-        cursor.execute("""
-            SELECT id, tags_json FROM products
-        """)
-        
-        products_to_delete = []
-        for row in cursor.fetchall():
-            product_id = row[0]
-            tags_json = row[1]
-            tags = json.loads(tags_json) if tags_json else []
-            
-            # Check if product has at least one company tag or one type tag
-            has_company_tag = any(tag.startswith('company_') for tag in tags)
-            has_type_tag = any(tag.startswith('type_') for tag in tags)
-            
-            # If it has neither, mark for deletion
-            if not has_company_tag and not has_type_tag:
-                products_to_delete.append(product_id)
-        
-        # Delete the products
-        deleted_count = 0
-        for product_id in products_to_delete:
-            cursor.execute("DELETE FROM products WHERE id = ?", (product_id,))
-            deleted_count += 1
-        
-        conn.commit()
-        conn.close()
+        deleted_count = database.delete_untagged_products()
         
         debug_print(f"Deleted {deleted_count} products without company or type tags")
         
@@ -881,6 +1094,29 @@ def adjust_special_color_percentages_endpoint(current_user: dict = Depends(auth.
         raise HTTPException(status_code=500, detail=f"An error occurred during special color percentage adjustment: {str(e)}")
 
 
+RETAG_WORKERS = vision.TAGGING_WORKERS
+RETAG_WRITE_BATCH_SIZE = 500
+
+
+def _retag_product(image_url: str, album_title: Optional[str], existing_tags: List[str]):
+    """Recompute the tags and color data for a single product (runs in the retag thread pool).
+
+    Returns:
+        A tuple of (final_tags, colors_data).
+    """
+    # Generate new color and company tags from vision analysis
+    new_tags, colors_data = vision.generate_tags_for_image(image_url, album_title or "")
+    
+    # Preserve existing type_ tags and other non-color/company tags
+    preserved_tags = [tag for tag in existing_tags if tag.startswith('type_')]
+    
+    # Combine preserved tags with new color/company tags, removing duplicates
+    # while preserving order in a single pass
+    seen = set()
+    final_tags = [tag for tag in chain(preserved_tags, new_tags) if not (tag in seen or seen.add(tag))]
+    return final_tags, colors_data
+
+
 @app.post("/api/colors/retag", summary="Retag all products with color detection")
 def retag_all_products_endpoint(current_user: dict = Depends(auth.get_current_admin)):
     """
@@ -902,33 +1138,37 @@ def retag_all_products_endpoint(current_user: dict = Depends(auth.get_current_ad
         failed = 0
         updated = 0
         
-        for product_id, image_url, album_title, existing_tags in products:
-            try:
-                # Generate new color and company tags from vision analysis
-                new_tags, colors_data = vision.generate_tags_for_image(image_url, album_title or "")
-                
-                # Preserve existing type_ tags and other non-color/company tags
-                preserved_tags = [tag for tag in existing_tags if tag.startswith('type_')]
-                
-                # Combine preserved tags with new color/company tags
-                final_tags = preserved_tags + new_tags
-                
-                # Remove duplicates while preserving order
-                final_tags = list(dict.fromkeys(final_tags))
+        # Image downloads dominate, so overlap them in a thread pool;
+        # database writes stay on this thread
+        with ThreadPoolExecutor(max_workers=RETAG_WORKERS) as executor:
+            future_to_product = {
+                executor.submit(_retag_product, image_url, album_title, existing_tags): product_id
+                for product_id, image_url, album_title, existing_tags in products
+            }
+            
+            pending_updates = []
+            for future in as_completed(future_to_product):
+                product_id = future_to_product[future]
+                try:
+                    final_tags, colors_data = future.result()
+                    pending_updates.append((product_id, final_tags, colors_data))
+                    processed += 1
+                    
+                except Exception as e:
+                    debug_print(f"Error retagging product {product_id}: {e}")
+                    failed += 1
+                    processed += 1
                 
-                # Update the product in the database
-                database.update_product_tags_and_colors(product_id, final_tags, colors_data)
-                updated += 1
-                processed += 1
+                # Write updates to the database in batches, one transaction each
+                if len(pending_updates) >= RETAG_WRITE_BATCH_SIZE:
+                    updated += database.update_products_tags_and_colors_batch(pending_updates)
+                    pending_updates = []
                 
-            except Exception as e:
-                debug_print(f"Error retagging product {product_id}: {e}")
-                failed += 1
-                processed += 1
+                # Log progress every 10 products
+                if processed % 10 == 0:
+                    debug_print(f"Progress: {processed}/{len(products)} products processed")
             
-            # Log progress every 10 products
-            if processed % 10 == 0:
-                debug_print(f"Progress: {processed}/{len(products)} products processed")
+            updated += database.update_products_tags_and_colors_batch(pending_updates)
         
         debug_print(f"Retagging complete: {updated} updated, {failed} failed")
         return {
@@ -9,28 +9,78 @@ adapt these functions if Yupoo's layout changes significantly.
 """
 
 import re
-import json
 import os
-from typing import List, Tuple, Optional
-from urllib.parse import urljoin
+import html
+import atexit
+import logging
+import logging.handlers
+import queue
+from typing import Dict, List, Tuple, Optional
+from urllib.parse import urljoin, urlsplit
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache
 
+import orjson
 import requests
-from bs4 import BeautifulSoup  # type: ignore
+from bs4 import BeautifulSoup, SoupStrainer  # type: ignore
+from requests.adapters import HTTPAdapter
+
+# Prefer the C-based lxml parser when it is installed; html.parser is pure Python
+try:
+    import lxml  # type: ignore  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+class _StdoutBufferHandler(logging.Handler):
+    """Logging handler that writes UTF-8 bytes straight to the stdout buffer."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = record.getMessage()
+        try:
+            # Write directly to stdout buffer with UTF-8 encoding to bypass Windows console encoding issues
+            output = f"[SCRAPER DEBUG] {message}\n"
+            sys.stdout.buffer.write(output.encode('utf-8'))
+            sys.stdout.buffer.flush()
+        except Exception:
+            # Fallback: replace problematic characters
+            safe_msg = message.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
+            print(f"[SCRAPER DEBUG] {safe_msg}", flush=True)
+
+
+_logger = logging.getLogger("yupoo.scraper")
+_logger.setLevel(logging.DEBUG)
+_logger.propagate = False
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_log_pid: Optional[int] = None
+
+
+def _get_logger() -> logging.Logger:
+    """Return the scraper logger, wiring it to a background writer thread on first use.
+
+    Fetch threads only enqueue records; a single QueueListener thread does the
+    stdout writes and flushes, so threads never contend on the stdout lock.
+    The listener is recreated after a fork since its thread does not survive it.
+    """
+    global _log_listener, _log_pid
+    if _log_pid != os.getpid():
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        for handler in list(_logger.handlers):
+            _logger.removeHandler(handler)
+        _logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _log_listener = logging.handlers.QueueListener(log_queue, _StdoutBufferHandler())
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+        _log_pid = os.getpid()
+    return _logger
 
 
 def debug_print(message: str):
-    """Print debug message with flush to ensure it appears in concurrent output."""
-    try:
-        # Write directly to stdout buffer with UTF-8 encoding to bypass Windows console encoding issues
-        output = f"[SCRAPER DEBUG] {message}\n"
-        sys.stdout.buffer.write(output.encode('utf-8'))
-        sys.stdout.buffer.flush()
-    except Exception:
-        # Fallback: replace problematic characters
-        safe_msg = message.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
-        print(f"[SCRAPER DEBUG] {safe_msg}", flush=True)
+    """Queue a debug message for the background log writer."""
+    _get_logger().debug(message)
 
 
 def load_clothing_tags() -> List[str]:
@@ -41,8 +91,8 @@ def load_clothing_tags() -> List[str]:
     """
     tags_file = os.path.join(os.path.dirname(__file__), "clothing_tags.json")
     try:
-        with open(tags_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(tags_file, 'rb') as f:
+            data = orjson.loads(f.read())
             tags = data.get("clothing_types", [])
             debug_print(f"Loaded {len(tags)} clothing tags")
             return tags
@@ -51,6 +101,33 @@ def load_clothing_tags() -> List[str]:
         return []
 
 
+# Loaded once at import so scrapes don't re-read and re-parse the file
+CLOTHING_TAGS: List[str] = load_clothing_tags()
+
+
+@lru_cache(maxsize=8)
+def _compile_tag_matcher(clothing_tags: Tuple[str, ...]) -> Tuple[Optional["re.Pattern[str]"], Dict[str, str]]:
+    """Build a single whole-word alternation regex for a list of clothing tags.
+
+    Tags are sorted longest first, so at any position the longer tag wins
+    (e.g. "T-SHIRT" over "SHIRT"). Matches from one regex pass never overlap.
+
+    Args:
+        clothing_tags: Tuple of available clothing tag keywords.
+
+    Returns:
+        The compiled pattern (None if there are no tags) and a mapping from
+        the uppercased tag text to its lowercase tag name.
+    """
+    lookup: Dict[str, str] = {}
+    for tag in sorted(clothing_tags, key=len, reverse=True):
+        lookup.setdefault(tag.upper(), tag.lower())
+    if not lookup:
+        return None, lookup
+    pattern = re.compile(r'\b(' + '|'.join(re.escape(tag) for tag in lookup) + r')\b')
+    return pattern, lookup
+
+
 def extract_clothing_tags_from_title(album_title: str, clothing_tags: List[str]) -> List[str]:
     """Extract clothing tags from album title by matching tag keywords.
     
@@ -66,81 +143,184 @@ def extract_clothing_tags_from_title(album_title: str, clothing_tags: List[str])
     if not album_title:
         return found_tags
     
-    # Normalize title for matching (uppercase, remove special characters)
-    normalized_title = album_title.upper()
-    
-    # Sort tags by length (longest first) to match longer tags before shorter ones
-    # This prevents "SHIRT" from matching when "T-SHIRT" is the intended match
-    sorted_tags = sorted(clothing_tags, key=len, reverse=True)
-    
-    # Keep track of matched regions to avoid overlapping matches
-    matched_regions = set()
+    pattern, lookup = _compile_tag_matcher(tuple(clothing_tags))
+    if pattern is None:
+        return found_tags
     
-    for tag in sorted_tags:
-        normalized_tag = tag.upper()
-        # Check if tag appears in title (case-insensitive, whole word match)
-        # Use word boundaries to match whole tags
-        pattern = r'\b' + re.escape(normalized_tag) + r'\b'
-        for match in re.finditer(pattern, normalized_title):
-            start, end = match.span()
-            # Check if this region overlaps with already matched regions
-            overlaps = any(s < end and e > start for s, e in matched_regions)
-            if not overlaps:
-                # Add type_ prefix and convert to lowercase
-                prefixed_tag = f"type_{tag.lower()}"
-                found_tags.append(prefixed_tag)
-                matched_regions.add((start, end))
-                debug_print(f"  Found clothing tag in title: {prefixed_tag}")
-                break  # Only match each tag once
+    # One pass over the uppercased title finds every non-overlapping tag
+    for match in pattern.finditer(album_title.upper()):
+        prefixed_tag = f"type_{lookup[match.group(1)]}"
+        if prefixed_tag not in found_tags:  # Only report each tag once
+            found_tags.append(prefixed_tag)
+            debug_print(f"  Found clothing tag in title: {prefixed_tag}")
     
     return found_tags
 
 
+# Browser headers sent with every request to avoid being blocked by servers.
+# They are installed once as the shared session's default headers.
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/1295.145.223.226 Safari/537.36',
+    'Referer': 'https://www.yupoo.com/',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Cache-Control': 'no-cache',
+    'Pragma': 'no-cache',
+}
+
+
 def get_headers() -> dict:
-    """Return browser headers to avoid being blocked by servers."""
-    return {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/1295.145.223.226 Safari/537.36',
-        'Referer': 'https://www.yupoo.com/',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Cache-Control': 'no-cache',
-        'Pragma': 'no-cache',
-    }
+    """Return browser headers to avoid being blocked by servers.
+
+    Requests made through `get_session()` already send these; this is for
+    callers that use another HTTP client.
+    """
+    return dict(_HEADERS)
+
+
+# Patterns used on every scraped page, compiled once at import
+COVER_RE = re.compile("cover", re.I)
+
+# Listing pages only need their album links, so they are scanned as raw bytes
+# with these patterns instead of being parsed into a DOM. Quoted attribute
+# values are matched whole, since they may contain a literal ">"
+ANCHOR_TAG_RE = re.compile(rb"""<a\s(?:[^>"']|"[^"]*"|'[^']*')*>""", re.I)
+ANCHOR_HREF_RE = re.compile(rb"""\shref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.I)
+ALBUM_MAIN_CLASS_RE = re.compile(rb"""\sclass\s*=\s*["']?[^"'>]*?\balbum_main\b""", re.I)
+ALBUM_HREF_RE = re.compile(r"/albums/\d+")
+# Album pages are only read for their header: title, cover and subtitle link
+# (regexes, since the strainer sees the raw multi-class attribute string)
+ALBUM_HEADER_STRAINER = SoupStrainer(
+    attrs={"class": re.compile(r"\bshowalbumheader__gallery(?:title|cover)\b")}
+)
+ALBUM_SUBTITLE_STRAINER = SoupStrainer(
+    attrs={"class": re.compile(r"\bshowalbumheader__gallerysubtitle\b")}
+)
+
+# Number of listing and album pages fetched concurrently
+ALBUM_FETCH_WORKERS = 20
+
+
+def absolute_url(base_url: str, url: str, origin: Optional[str] = None) -> str:
+    """Resolve `url` against `base_url`, skipping `urljoin` when it is already absolute.
+
+    When the caller passes the site `origin` (see `site_origin`), root-relative
+    paths such as "/albums/123" are joined by plain concatenation as well.
+    """
+    if url.startswith(("http://", "https://")):
+        return url
+    if origin and url.startswith("/") and not url.startswith("//"):
+        return origin + url
+    return urljoin(base_url, url)
+
+
+def site_origin(base_url: str) -> str:
+    """Return the "scheme://host" part of `base_url`, for use with `absolute_url`."""
+    parts = urlsplit(base_url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def page_url_prefix(base_url: str) -> str:
+    """Return the listing URL prefix that a page number is appended to."""
+    return base_url + ("&page=" if '?' in base_url else "?page=")
+
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
 
 
-def fetch_page_for_count(base_url: str, page_number: int) -> Tuple[int, int]:
-    """Fetch a single page and count albums (for parallel scanning).
+def get_session() -> requests.Session:
+    """Return the shared HTTP session used for all Yupoo requests.
+
+    Reusing one session keeps TCP/TLS connections alive between requests
+    instead of re-handshaking for every page. The pool is sized for the
+    parallel page and album fetches. A new session is created after a
+    fork so processes never share pooled sockets.
+    """
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        session = requests.Session()
+        session.headers.update(_HEADERS)
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session = session
+        _session_pid = os.getpid()
+    return _session
+
+
+_fetch_executor: Optional[ThreadPoolExecutor] = None
+_fetch_executor_pid: Optional[int] = None
+
+
+def get_fetch_executor() -> ThreadPoolExecutor:
+    """Return the shared thread pool used for parallel page and album fetches.
+
+    The pool lives for the whole process instead of being created and torn
+    down for every batch of pages or albums, so worker threads are reused
+    across a scrape. Like the session, it is recreated after a fork.
+    """
+    global _fetch_executor, _fetch_executor_pid
+    if _fetch_executor is None or _fetch_executor_pid != os.getpid():
+        _fetch_executor = ThreadPoolExecutor(
+            max_workers=ALBUM_FETCH_WORKERS, thread_name_prefix="yupoo-fetch"
+        )
+        _fetch_executor_pid = os.getpid()
+    return _fetch_executor
+
+
+def extract_album_hrefs(content: bytes) -> List[str]:
+    """Collect album link hrefs from the raw HTML of a listing page.
+
+    Anchors with the `album_main` class are preferred; if there are none,
+    any anchor linking to `/albums/<id>` is used instead.
+
+    Args:
+        content: Raw response body of the listing page.
+
+    Returns:
+        The album hrefs in page order (entity-decoded, possibly relative).
+    """
+    album_main_hrefs = []
+    fallback_hrefs = []
+    for tag in ANCHOR_TAG_RE.findall(content):
+        match = ANCHOR_HREF_RE.search(tag)
+        if not match:
+            continue
+        raw_href = next(group for group in match.groups() if group is not None)
+        href = html.unescape(raw_href.decode("utf-8", "replace"))
+        if not href:
+            continue
+        if ALBUM_MAIN_CLASS_RE.search(tag):
+            album_main_hrefs.append(href)
+        elif not album_main_hrefs and ALBUM_HREF_RE.search(href):
+            fallback_hrefs.append(href)
+    return album_main_hrefs or fallback_hrefs
+
+
+def fetch_page_for_count(url_prefix: str, page_number: int) -> Tuple[int, List[str]]:
+    """Fetch a single listing page and collect its album links (for parallel scanning).
     
     Args:
-        base_url: The base URL
+        url_prefix: Listing URL prefix from `page_url_prefix`
         page_number: The page number to fetch
         
     Returns:
-        Tuple of (page_number, album_count) or (page_number, 0) if failed
+        Tuple of (page_number, album_hrefs) or (page_number, []) if failed
     """
     try:
-        if '?' in base_url:
-            page_url = f"{base_url}&page={page_number}"
-        else:
-            page_url = f"{base_url}?page={page_number}"
-        
+        page_url = f"{url_prefix}{page_number}"
         debug_print(f"[Count Thread] Fetching page {page_number}")
-        resp = requests.get(page_url, timeout=15, headers=get_headers())
+        resp = get_session().get(page_url, timeout=15)
         resp.raise_for_status()
         
-        soup = BeautifulSoup(resp.text, "html.parser")
-        album_anchors = soup.find_all("a", class_="album_main")
-        
-        if not album_anchors:
-            album_anchors = soup.find_all("a", href=re.compile(r"/albums/\d+"))
-        
-        albums_on_page = len(album_anchors)
-        debug_print(f"[Count Thread] Page {page_number}: {albums_on_page} albums")
-        return (page_number, albums_on_page)
+        album_hrefs = extract_album_hrefs(resp.content)
+        debug_print(f"[Count Thread] Page {page_number}: {len(album_hrefs)} albums")
+        return (page_number, album_hrefs)
     except Exception as exc:
         debug_print(f"[Count Thread] Error on page {page_number}: {exc}")
-        return (page_number, 0)
+        return (page_number, [])
 
 
 def count_total_albums(base_url: str, max_albums: int = 2000):
@@ -151,7 +331,8 @@ def count_total_albums(base_url: str, max_albums: int = 2000):
         max_albums: Maximum albums to look for (stops early if found)
 
     Yields:
-        Progress updates as dicts with 'type', 'page', 'albums_on_page', and 'total_so_far'
+        Progress updates as dicts with 'type', 'page', 'albums_on_page',
+        'total_so_far' and the page's 'album_hrefs'
         Final update with 'type': 'count_complete' and 'total'
     """
     debug_print(f"Scanning total albums at: {base_url} (will stop at {max_albums})")
@@ -159,6 +340,7 @@ def count_total_albums(base_url: str, max_albums: int = 2000):
     current_batch = 1
     batch_size = 20  # Fetch 20 pages in parallel per batch
     last_page_had_albums = True
+    url_prefix = page_url_prefix(base_url)
     
     while last_page_had_albums and total_count < max_albums:
         # Determine pages to fetch in this batch
@@ -170,49 +352,50 @@ def count_total_albums(base_url: str, max_albums: int = 2000):
         debug_print(f"Fetching pages {pages_to_fetch[0]}-{pages_to_fetch[-1]} in parallel")
         
         # Fetch multiple pages in parallel
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            future_to_page = {
-                executor.submit(fetch_page_for_count, base_url, page_num): page_num
-                for page_num in pages_to_fetch
+        executor = get_fetch_executor()
+        future_to_page = {
+            executor.submit(fetch_page_for_count, url_prefix, page_num): page_num
+            for page_num in pages_to_fetch
+        }
+        
+        # Process results in order
+        batch_results = []
+        for future in as_completed(future_to_page):
+            page_num = future_to_page[future]
+            try:
+                batch_results.append(future.result())
+            except Exception as e:
+                debug_print(f"Exception fetching page {page_num}: {e}")
+                batch_results.append((page_num, []))
+        
+        # Sort results by page number to process in order
+        batch_results.sort(key=lambda x: x[0])
+        
+        # Process each page result
+        for page_number, album_hrefs in batch_results:
+            albums_on_page = len(album_hrefs)
+            debug_print(f"Counting page {page_number}: {albums_on_page} albums")
+            
+            yield {
+                "type": "page_scanned",
+                "page": page_number,
+                "albums_on_page": albums_on_page,
+                "total_so_far": total_count + albums_on_page,
+                "album_hrefs": album_hrefs
             }
             
-            # Process results in order
-            batch_results = []
-            for future in as_completed(future_to_page):
-                page_num = future_to_page[future]
-                try:
-                    page_number, albums_on_page = future.result()
-                    batch_results.append((page_number, albums_on_page))
-                except Exception as e:
-                    debug_print(f"Exception fetching page {page_num}: {e}")
-                    batch_results.append((page_num, 0))
+            if albums_on_page == 0:
+                debug_print(f"No albums on page {page_number}, stopping scan")
+                last_page_had_albums = False
+                break
             
-            # Sort results by page number to process in order
-            batch_results.sort(key=lambda x: x[0])
+            total_count += albums_on_page
             
-            # Process each page result
-            for page_number, albums_on_page in batch_results:
-                debug_print(f"Counting page {page_number}: {albums_on_page} albums")
-                
-                yield {
-                    "type": "page_scanned",
-                    "page": page_number,
-                    "albums_on_page": albums_on_page,
-                    "total_so_far": total_count + albums_on_page
-                }
-                
-                if albums_on_page == 0:
-                    debug_print(f"No albums on page {page_number}, stopping scan")
-                    last_page_had_albums = False
-                    break
-                
-                total_count += albums_on_page
-                
-                # Early stop if we've found enough albums
-                if total_count >= max_albums:
-                    debug_print(f"Found {total_count} albums, reached max_albums limit")
-                    last_page_had_albums = False
-                    break
+            # Early stop if we've found enough albums
+            if total_count >= max_albums:
+                debug_print(f"Found {total_count} albums, reached max_albums limit")
+                last_page_had_albums = False
+                break
         
         if last_page_had_albums:
             current_batch += 1
@@ -224,27 +407,31 @@ def count_total_albums(base_url: str, max_albums: int = 2000):
     }
 
 
-def fetch_album_details(album_url: str, album_number: int, clothing_tags: List[str]) -> Optional[Tuple[int, str, str, str, List[str]]]:
+def fetch_album_details(album_url: str, album_number: int) -> Optional[Tuple[int, str, str, str]]:
     """Fetch details for a single album (to be used with ThreadPoolExecutor).
     
+    Only network fetch and header parsing happen here; title tagging is left
+    to the caller so the fetch thread is free for the next album sooner.
+    
     Args:
         album_url: URL of the album
         album_number: Album number for tracking
-        clothing_tags: List of clothing tags to search
         
     Returns:
-        Tuple of (album_number, album_url, album_title, img_url, tags) or None if failed
+        Tuple of (album_number, album_url, album_title, img_url) or None if failed
     """
     try:
         debug_print(f"[Thread] Fetching album {album_number}: {album_url}")
-        album_resp = requests.get(album_url, timeout=15, headers=get_headers())
+        album_resp = get_session().get(album_url, timeout=15)
         album_resp.raise_for_status()
     except Exception as e:
         debug_print(f"[Thread] ERROR fetching album {album_number}: {e}")
         return None
     
-    # Parse the album page to find the cover image and title
-    album_soup = BeautifulSoup(album_resp.text, "html.parser")
+    # Parse the album page to find the cover image and title. The raw bytes are
+    # handed to the parser, which honours the page's declared charset, instead
+    # of having requests guess an encoding and decode to str first
+    album_soup = BeautifulSoup(album_resp.content, HTML_PARSER, parse_only=ALBUM_HEADER_STRAINER)
     
     # Extract album title
     album_title = ""
@@ -270,13 +457,11 @@ def fetch_album_details(album_url: str, album_number: int, clothing_tags: List[s
     if img_url.startswith("//"):
         img_url = "https:" + img_url
     else:
-        img_url = urljoin(album_url, img_url)
+        img_url = absolute_url(album_url, img_url)
     
-    # Extract clothing tags
-    tags = extract_clothing_tags_from_title(album_title, clothing_tags)
     debug_print(f"[Thread] Album {album_number}: Success - {album_title}")
     
-    return (album_number, album_url, album_title, img_url, tags)
+    return (album_number, album_url, album_title, img_url)
 
 
 def get_album_links_and_covers(base_url: str, max_albums: int = 50):
@@ -296,10 +481,28 @@ def get_album_links_and_covers(base_url: str, max_albums: int = 50):
     debug_print(f"Base URL: {base_url}")
     debug_print(f"Max albums to fetch: {max_albums}")
     
+    # Clothing tags are preloaded at import; retry the load if that failed
+    clothing_tags = CLOTHING_TAGS or load_clothing_tags()
+    
+    results: List[Tuple[str, str, str, List[str]]] = []
+    album_counter = 0  # Global counter for album numbers
+    future_to_album = {}
+    executor = get_fetch_executor()
+    # Album links beyond max_albums, used to replace albums that fail to fetch
+    spare_hrefs = deque()
+    last_page = 0
+    listing_exhausted = False
+    
     total_albums = 0
     yield {"type": "scanning_pages", "message": f"Scanning pages to count total albums..."}
     
-    # Count albums and yield page scan updates (pass max_albums to stop early)
+    origin = site_origin(base_url)
+    url_prefix = page_url_prefix(base_url)
+    
+    # Count albums and yield page scan updates (pass max_albums to stop early).
+    # Each scanned page already carries its album links, so album pages are
+    # queued for fetching straight away instead of after the scan finishes
+    # and without downloading the listing page a second time.
     for scan_update in count_total_albums(base_url, max_albums=max_albums):
         if scan_update["type"] == "page_scanned":
             debug_print(f"Page {scan_update['page']}: {scan_update['albums_on_page']} albums (total so far: {scan_update['total_so_far']})")
@@ -308,6 +511,17 @@ def get_album_links_and_covers(base_url: str, max_albums: int = 50):
                 "page": scan_update["page"],
                 "albums_found": scan_update["total_so_far"]
             }
+            last_page = scan_update["page"]
+            if not scan_update["album_hrefs"]:
+                listing_exhausted = True
+            for href in scan_update["album_hrefs"]:
+                if album_counter >= max_albums:
+                    spare_hrefs.append(href)
+                    continue
+                album_counter += 1
+                album_url = absolute_url(base_url, href, origin)
+                future = executor.submit(fetch_album_details, album_url, album_counter)
+                future_to_album[future] = (album_counter, album_url)
         elif scan_update["type"] == "count_complete":
             total_albums = scan_update["total"]
             debug_print(f"Total albums available: {total_albums}")
@@ -317,141 +531,63 @@ def get_album_links_and_covers(base_url: str, max_albums: int = 50):
                 "will_fetch": min(total_albums, max_albums)
             }
     
-    # Load clothing tags
-    clothing_tags = load_clothing_tags()
-    
-    results: List[Tuple[str, str, str, List[str]]] = []
-    current_page = 1
-    album_counter = 0  # Global counter for album numbers
-    
     yield {"type": "scrape_start", "message": f"Starting to scrape {min(total_albums, max_albums)} albums from {total_albums} available..."}
-
     
-    while len(results) < max_albums:
-        # Build pagination URL
-        if '?' in base_url:
-            page_url = f"{base_url}&page={current_page}"
-        elif base_url.endswith('/'):
-            if 'albums' in base_url:
-                page_url = f"{base_url}?page={current_page}"
-            else:
-                page_url = f"{base_url}?page={current_page}"
-        else:
-            page_url = f"{base_url}?page={current_page}"
-        
-        debug_print(f"\n--- Fetching page {current_page}: {page_url} ---")
-        yield {
-            "type": "fetching_page",
-            "page": current_page,
-            "url": page_url
-        }
-        
-        try:
-            debug_print(f"Fetching page URL: {page_url}")
-            resp = requests.get(page_url, timeout=15, headers=get_headers())
-            resp.raise_for_status()
-            debug_print(f"Successfully fetched page. Status: {resp.status_code}")
-        except Exception as exc:
-            debug_print(f"ERROR fetching page {current_page}: {exc}")
-            yield {
-                "type": "page_error",
-                "page": current_page,
-                "error": str(exc)
-            }
-            break
-        
-        debug_print("Parsing HTML with BeautifulSoup")
-        soup = BeautifulSoup(resp.text, "html.parser")
-        
-        # Get all album links from this page
-        debug_print("Looking for album links...")
-        album_anchors = soup.find_all("a", class_="album_main")
-        debug_print(f"Found {len(album_anchors)} album_main links on page {current_page}")
-        
-        if not album_anchors:
-            debug_print("No album_main links found, trying fallback /albums/ pattern...")
-            album_anchors = soup.find_all("a", href=re.compile(r"/albums/\d+"))
-            debug_print(f"Found {len(album_anchors)} /albums/ links on page {current_page}")
-        
-        # If no albums found on this page, we've reached the end
-        if not album_anchors:
-            debug_print(f"No albums found on page {current_page}, pagination complete")
-            yield {
-                "type": "page_empty",
-                "page": current_page
-            }
-            break
-        
-        yield {
-            "type": "page_albums_found",
-            "page": current_page,
-            "albums_on_page": len(album_anchors)
-        }
-        
-        # Extract album URLs from this page
-        album_urls_to_fetch = []
-        for a in album_anchors:
-            if len(results) + len(album_urls_to_fetch) >= max_albums:
-                break
-            
-            href = a.get("href")
-            if href:
-                album_url = urljoin(base_url, href)
-                album_counter += 1
-                album_urls_to_fetch.append((album_counter, album_url))
-        
-        debug_print(f"Will fetch {len(album_urls_to_fetch)} albums from page {current_page} in parallel")
-        
-        # Fetch albums in parallel using ThreadPoolExecutor with 5 workers
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            # Submit all album fetch tasks
-            future_to_album = {
-                executor.submit(fetch_album_details, album_url, album_num, clothing_tags): (album_num, album_url)
-                for album_num, album_url in album_urls_to_fetch
-            }
-            
-            # Process results as they complete
-            for future in as_completed(future_to_album):
-                album_num, album_url = future_to_album[future]
-                try:
-                    result = future.result()
-                    if result:
-                        album_number, fetched_url, album_title, img_url, tags = result
-                        debug_print(f"Album {album_number} completed successfully")
-                        yield {
-                            "type": "album_success",
-                            "album_number": album_number,
-                            "album_title": album_title,
-                            "album_url": fetched_url,
-                            "clothing_tags": tags
-                        }
-                        results.append((fetched_url, img_url, album_title, tags))
-                    else:
-                        debug_print(f"Album {album_num} failed to fetch")
-                        yield {
-                            "type": "album_fetch_error",
-                            "album_number": album_num,
-                            "album_url": album_url,
-                            "error": "Failed to extract album details"
-                        }
-                except Exception as e:
-                    debug_print(f"Album {album_num} exception: {e}")
+    # Process results as they complete; album pages are pure network latency, so
+    # many requests stay in flight over the shared session's connection pool
+    pending = set(future_to_album)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            album_num, album_url = future_to_album.pop(future)
+            try:
+                result = future.result()
+                if result:
+                    album_number, fetched_url, album_title, img_url = result
+                    # Extract clothing tags
+                    tags = extract_clothing_tags_from_title(album_title, clothing_tags)
+                    debug_print(f"Album {album_number} completed successfully")
                     yield {
-                        "type": "album_fetch_error",
-                        "album_number": album_num,
-                        "album_url": album_url,
-                        "error": str(e)
+                        "type": "album_success",
+                        "album_number": album_number,
+                        "album_title": album_title,
+                        "album_url": fetched_url,
+                        "clothing_tags": tags
                     }
-        
-        # If we're still under the limit and found albums on this page, continue to next page
-        if len(results) < max_albums and len(album_urls_to_fetch) > 0:
-            current_page += 1
-        else:
-            # Either reached max_albums or no albums found on this page
-            break
+                    results.append((fetched_url, img_url, album_title, tags))
+                    continue
+                debug_print(f"Album {album_num} failed to fetch")
+                yield {
+                    "type": "album_fetch_error",
+                    "album_number": album_num,
+                    "album_url": album_url,
+                    "error": "Failed to extract album details"
+                }
+            except Exception as e:
+                debug_print(f"Album {album_num} exception: {e}")
+                yield {
+                    "type": "album_fetch_error",
+                    "album_number": album_num,
+                    "album_url": album_url,
+                    "error": str(e)
+                }
+            
+            # Replace the failed album with the next one in the listing, reading
+            # further listing pages once the scanned ones are used up
+            while not spare_hrefs and not listing_exhausted:
+                last_page += 1
+                _, page_hrefs = fetch_page_for_count(url_prefix, last_page)
+                if not page_hrefs:
+                    listing_exhausted = True
+                spare_hrefs.extend(page_hrefs)
+            if spare_hrefs:
+                album_counter += 1
+                album_url = absolute_url(base_url, spare_hrefs.popleft(), origin)
+                future = executor.submit(fetch_album_details, album_url, album_counter)
+                future_to_album[future] = (album_counter, album_url)
+                pending.add(future)
     
     debug_print(f"\n=== SCRAPING COMPLETE ===")
-    debug_print(f"Total pages scanned: {current_page}")
     debug_print(f"Total albums found and processed: {len(results)}")
     
     yield {
@@ -474,21 +610,21 @@ def get_cover_from_album(album_url: str) -> str:
         The URL of the cover image or an empty string.
     """
     try:
-        resp = requests.get(album_url, timeout=15)
+        resp = get_session().get(album_url, timeout=15)
         resp.raise_for_status()
     except Exception as exc:
         print(f"Error fetching album page {album_url}: {exc}")
         return ""
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = BeautifulSoup(resp.content, HTML_PARSER)
     # Try to locate an <img> with a 'cover' class or id
-    img = soup.find("img", {"class": re.compile("cover", re.I)}) or soup.find(
-        "img", {"id": re.compile("cover", re.I)}
+    img = soup.find("img", {"class": COVER_RE}) or soup.find(
+        "img", {"id": COVER_RE}
     )
     if not img:
         # Fallback: pick the first image on the page
         img = soup.find("img")
     if img and img.get("src"):
-        return urljoin(album_url, img["src"])
+        return absolute_url(album_url, img["src"])
     return ""
 
 
@@ -499,13 +635,13 @@ def get_external_link_from_album(album_url: str) -> Optional[str]:
     """
     try:
         debug_print(f"Fetching album for external link: {album_url}")
-        resp = requests.get(album_url, timeout=15, headers=get_headers())
+        resp = get_session().get(album_url, timeout=15)
         resp.raise_for_status()
     except Exception as e:
         debug_print(f"ERROR fetching album page {album_url}: {e}")
         return None
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = BeautifulSoup(resp.content, HTML_PARSER, parse_only=ALBUM_SUBTITLE_STRAINER)
 
     # Find the container for the subtitle/description
     subtitle_div = soup.find("div", class_="showalbumheader__gallerysubtitle")
@@ -3,12 +3,14 @@ Translation module for normalizing brand/company names using translate.json.
 Handles obfuscated names and provides lookup functionality.
 """
 
-import json
 import os
-from typing import Dict, List, Optional
-from difflib import SequenceMatcher
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import sys
 
+import orjson
+
 
 def debug_print(message: str):
     """Print debug message with flush to ensure it appears in concurrent output."""
@@ -23,23 +25,33 @@ def debug_print(message: str):
 
 # Load translation database
 _TRANSLATE_DB: Dict[str, Optional[str]] = {}
+# Same table keyed by lowercased name (first key wins) for case-insensitive lookups
+_TRANSLATE_DB_LOWER: Dict[str, Optional[str]] = {}
+# Whole-word alternation over every translatable brand, plus a lookup from the
+# matched (uppercased) text to its (obfuscated name, translated name)
+_BRAND_RE: Optional["re.Pattern[str]"] = None
+_BRAND_LOOKUP: Dict[str, Tuple[str, str]] = {}
 
 
 def _load_translations() -> Dict[str, Optional[str]]:
     """Load translations from translate.json file."""
-    global _TRANSLATE_DB
+    global _TRANSLATE_DB, _TRANSLATE_DB_LOWER
     if _TRANSLATE_DB:
         return _TRANSLATE_DB
     
     try:
         json_path = os.path.join(os.path.dirname(__file__), "translate.json")
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(json_path, 'rb') as f:
+            data = orjson.loads(f.read())
             # Extract the brands dictionary if it exists, otherwise assume the file is just the dict
             if isinstance(data, dict) and 'brands' in data:
                 _TRANSLATE_DB = data['brands']
             else:
                 _TRANSLATE_DB = data
+        _TRANSLATE_DB_LOWER = {}
+        for key, value in _TRANSLATE_DB.items():
+            _TRANSLATE_DB_LOWER.setdefault(key.lower(), value)
+        _translate_cached.cache_clear()
         debug_print(f"Loaded {len(_TRANSLATE_DB)} brand translations")
         return _TRANSLATE_DB
     except Exception as e:
@@ -47,6 +59,33 @@ def _load_translations() -> Dict[str, Optional[str]]:
         return {}
 
 
+def _get_brand_matcher() -> Tuple[Optional["re.Pattern[str]"], Dict[str, Tuple[str, str]]]:
+    """Compile one alternation regex covering every translatable brand."""
+    global _BRAND_RE, _BRAND_LOOKUP
+    if _BRAND_RE is not None:
+        return _BRAND_RE, _BRAND_LOOKUP
+    
+    db = _load_translations()
+    # Sort by length (longest first) so longer brands win at any position.
+    # Word boundaries avoid matching 'LEE' in 'SLEEVED' or 'ON' in 'LONG'
+    lookup: Dict[str, Tuple[str, str]] = {}
+    for name in sorted(db.keys(), key=len, reverse=True):
+        if db[name]:
+            lookup.setdefault(name.upper(), (name, db[name]))
+    if lookup:
+        _BRAND_RE = re.compile(r'\b(' + '|'.join(re.escape(key) for key in lookup) + r')\b')
+        _BRAND_LOOKUP = lookup
+    return _BRAND_RE, _BRAND_LOOKUP
+
+
+@lru_cache(maxsize=4096)
+def _translate_cached(text: str) -> str:
+    """Look up `text` in the loaded translation tables (exact, then case-insensitive)."""
+    if text in _TRANSLATE_DB:
+        return _TRANSLATE_DB[text] or text
+    return _TRANSLATE_DB_LOWER.get(text.lower()) or text
+
+
 def translate_name(text: str) -> str:
     """
     Translate a brand name using the translation database.
@@ -63,24 +102,12 @@ def translate_name(text: str) -> str:
     if not text or not db:
         return text
     
-    # Try exact match first
-    if text in db:
-        translated = db[text]
-        return translated if translated else text
-    
-    # Try case-insensitive match
-    text_lower = text.lower()
-    for key, value in db.items():
-        if key.lower() == text_lower:
-            return value if value else text
-    
-    # Return original if no match
-    return text
+    return _translate_cached(text)
 
 
 def extract_brands_from_text(text: str) -> List[str]:
     """
-    Extract potential brand names from text using fuzzy matching against translate.json.
+    Extract potential brand names from text using whole-word matching against translate.json.
     
     Args:
         text: The text to extract brands from (e.g., album title)
@@ -91,41 +118,21 @@ def extract_brands_from_text(text: str) -> List[str]:
     if not text:
         return []
     
-    db = _load_translations()
-    if not db:
+    brand_re, lookup = _get_brand_matcher()
+    if brand_re is None:
         return []
     
-    import re
-    
+    # A single regex pass yields every non-overlapping brand in the text
     detected_brands = set()
-    text_upper = text.upper()
-    
-    # Sort by length (longest first) to match longer brands before shorter ones
-    sorted_brands = sorted(db.keys(), key=len, reverse=True)
-    
-    # Keep track of matched positions to avoid overlapping matches
-    matched_positions = set()
-    
-    # Check for each known brand in the text
-    for obfuscated_name in sorted_brands:
-        obfuscated_upper = obfuscated_name.upper()
-        translated = db[obfuscated_name]
-        
-        if not translated:  # Skip if no translation
-            continue
-        
-        # Use word boundaries for matching to avoid matching 'LEE' in 'SLEEVED' or 'ON' in 'LONG'
-        # But allow star emojis to be part of the pattern
-        pattern = r'\b' + re.escape(obfuscated_upper) + r'\b'
-        
-        for match in re.finditer(pattern, text_upper):
-            start, end = match.span()
-            # Check if this position overlaps with already matched positions
-            overlaps = any(s < end and e > start for s, e in matched_positions)
-            if not overlaps:
-                detected_brands.add(translated)
-                matched_positions.add((start, end))
-                debug_print(f"  Found brand '{obfuscated_name}' -> '{translated}'")
-                break  # Only match each brand pattern once
+    for match in brand_re.finditer(text.upper()):
+        obfuscated_name, translated = lookup[match.group(1)]
+        if translated not in detected_brands:
+            detected_brands.add(translated)
+            debug_print(f"  Found brand '{obfuscated_name}' -> '{translated}'")
     
     return sorted(list(detected_brands))
+
+
+# Load the table and build the brand regex at import so the first album
+# tagged in each worker doesn't pay for it
+_get_brand_matcher()
@@ -19,13 +19,26 @@ custom logic could be added.
 
 import cv2  # type: ignore
 import numpy as np  # type: ignore
-import requests
+import hashlib
+import os
 import sys
-from collections import Counter
-from io import BytesIO
-from typing import Iterable, List, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
 
-from . import translator
+from . import scraper, translator
+
+
+# Only the Accept header differs from the scraper's session defaults
+_IMAGE_HEADERS = {
+    'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
+}
+
+
+# Per-image debug output is verbose and flushes stdout on every line, so it
+# is off unless YUPOO_VISION_DEBUG=1. Call sites check this flag first to
+# skip building the messages as well.
+_DEBUG = os.environ.get("YUPOO_VISION_DEBUG", "0") not in ("", "0")
 
 
 def debug_print(message: str):
@@ -56,55 +69,6 @@ def _detect_clothing_items(image: np.ndarray) -> List[Tuple[str, Tuple[int, int,
     return []
 
 
-def _get_item_colors(image: np.ndarray, bbox: Tuple[int, int, int, int], item_name: str) -> List[str]:
-    """
-    Extract dominant colors from a clothing item's bounding box.
-    
-    Args:
-        image: BGR image array
-        bbox: Bounding box (x1, y1, x2, y2)
-        item_name: Name of the clothing item for logging
-        
-    Returns:
-        List of color tags like ["color_blue", "color_white"]
-    """
-    x1, y1, x2, y2 = bbox
-    
-    # Ensure bounds are valid
-    x1 = max(0, x1)
-    y1 = max(0, y1)
-    x2 = min(image.shape[1], x2)
-    y2 = min(image.shape[0], y2)
-    
-    # Extract region of interest
-    roi = image[y1:y2, x1:x2]
-    
-    if roi.size == 0:
-        return []
-    
-    color_tags = []
-    
-    try:
-        # Get dominant colors from the item
-        dominant_colors = _dominant_colors(roi, k=2)
-        
-        for color_idx, color in enumerate(dominant_colors[:2]):
-            color_name = _bgr_to_color_name(color)
-            if color_idx == 0:
-                # First (dominant) color gets higher priority
-                tag = f"color_{color_name}_{item_name}"
-            else:
-                tag = f"color_{color_name}_{item_name}"
-            
-            color_tags.append(tag)
-            debug_print(f"    Color {color_idx + 1}: {color_name} -> {tag}")
-    
-    except Exception as e:
-        debug_print(f"  Error extracting colors for {item_name}: {e}")
-    
-    return color_tags
-
-
 def detect_clothing_in_image(image_url: str) -> Tuple[bool, str]:
     """
     Accept all images for tagging (no rejection).
@@ -116,90 +80,210 @@ def detect_clothing_in_image(image_url: str) -> Tuple[bool, str]:
     Returns:
         Tuple of (True, description) - always accepts
     """
-    debug_print(f"\n[IMAGE ACCEPTANCE] Accepting image for tagging")
+    if _DEBUG:
+        debug_print(f"\n[IMAGE ACCEPTANCE] Accepting image for tagging")
     return True, "image_accepted"
 
 
-def _fetch_image_array(url: str) -> np.ndarray:
-    """Download an image from `url` and return it as a BGR NumPy array.
+class ImageFetchError(RuntimeError):
+    """Raised when an image cannot be downloaded."""
+
+
+class ImageDecodeError(RuntimeError):
+    """Raised when downloaded bytes cannot be decoded as an image."""
+
+
+def _fetch_image_bytes(url: str) -> bytes:
+    """Download the raw (still encoded) bytes of the image at `url`.
 
     Args:
         url: The URL of the image to download.
 
     Returns:
-        The decoded image in BGR colour space.
+        The response body.
 
     Raises:
-        RuntimeError: If the image cannot be downloaded or decoded.
+        ImageFetchError: If the image cannot be downloaded.
     """
-    debug_print(f"Fetching image from URL: {url}")
-    
-    # Add proper headers to avoid being blocked by the server
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/1295.145.223.226 Safari/537.36',
-        'Referer': 'https://www.yupoo.com/',
-        'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Cache-Control': 'no-cache',
-        'Pragma': 'no-cache',
-    }
+    if _DEBUG:
+        debug_print(f"Fetching image from URL: {url}")
     
     try:
-        resp = requests.get(url, timeout=10, headers=headers)
-        resp.raise_for_status()
-        debug_print(f"Image downloaded, size: {len(resp.content)} bytes")
+        # The shared scraper session keeps connections to the image host alive.
+        # Streaming and reading the raw body in one call avoids requests
+        # buffering the payload as chunks and then joining them into a copy.
+        with scraper.get_session().get(url, timeout=10, headers=_IMAGE_HEADERS, stream=True) as resp:
+            resp.raise_for_status()
+            content = resp.raw.read(decode_content=True)
     except Exception as e:
         debug_print(f"ERROR fetching image: {e}")
-        raise
-    
-    img_data = np.frombuffer(resp.content, np.uint8)
-    image = cv2.imdecode(img_data, cv2.IMREAD_COLOR)
+        raise ImageFetchError(f"Failed to fetch image from {url}: {e}") from e
+    if _DEBUG:
+        debug_print(f"Image downloaded, size: {len(content)} bytes")
+    return content
+
+
+# imdecode flags for decoding at 1/2, 1/4 or 1/8 scale (libjpeg DCT scaling)
+_REDUCED_DECODE_FLAGS = {
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+# Colour analysis works on a 64x64 thumbnail; reduced decodes must not go below it
+ANALYSIS_SIZE = 64
+# Decode scale used for colour tagging
+COLOR_DECODE_SCALE = 4
+
+
+def _decode_image(data: bytes, source: str = "image data", decode_scale: int = 1) -> np.ndarray:
+    """Decode encoded image bytes into a BGR NumPy array.
+
+    Args:
+        data: Encoded image bytes (JPEG, PNG, ...).
+        source: Description of where the bytes came from, for error messages.
+        decode_scale: Decode at 1/1, 1/2, 1/4 or 1/8 of the full size. If the
+            reduced image would be smaller than `ANALYSIS_SIZE` on either
+            side, the image is decoded at full size instead.
+
+    Returns:
+        The decoded image in BGR colour space.
+
+    Raises:
+        ImageDecodeError: If the bytes cannot be decoded.
+    """
+    img_data = np.frombuffer(data, np.uint8)
+    image = cv2.imdecode(img_data, _REDUCED_DECODE_FLAGS.get(decode_scale, cv2.IMREAD_COLOR))
+    if image is not None and decode_scale > 1 and min(image.shape[:2]) < ANALYSIS_SIZE:
+        # Small source image; decode it at full size instead
+        image = cv2.imdecode(img_data, cv2.IMREAD_COLOR)
     if image is None:
-        debug_print(f"ERROR: Failed to decode image from {url}")
-        raise RuntimeError(f"Failed to decode image from {url}")
+        debug_print(f"ERROR: Failed to decode image from {source}")
+        raise ImageDecodeError(f"Failed to decode image from {source}")
     
-    debug_print(f"Image decoded successfully, shape: {image.shape}")
+    if _DEBUG:
+        debug_print(f"Image decoded successfully, shape: {image.shape}")
     return image
 
 
+def _fetch_image_array(url: str, decode_scale: int = 1) -> np.ndarray:
+    """Download an image from `url` and return it as a BGR NumPy array.
+
+    Args:
+        url: The URL of the image to download.
+        decode_scale: Reduced decode factor, see `_decode_image`. Keep the
+            default of 1 for anything that needs full resolution.
+
+    Returns:
+        The decoded image in BGR colour space.
+
+    Raises:
+        ImageFetchError: If the image cannot be downloaded.
+        ImageDecodeError: If the image cannot be decoded.
+    """
+    return _decode_image(_fetch_image_bytes(url), url, decode_scale)
+
+
+# Per-thread 64x64 BGR buffer reused by `_thumbnail`
+_thread_local = threading.local()
+
+
+def _thumbnail(image: np.ndarray) -> np.ndarray:
+    """Area-average a BGR image down to `ANALYSIS_SIZE` x `ANALYSIS_SIZE`.
+
+    The result is written into a buffer owned by the calling thread, so it
+    is only valid until that thread's next call.
+
+    Args:
+        image: BGR image.
+
+    Returns:
+        The downsampled image.
+    """
+    buf = getattr(_thread_local, "thumbnail", None)
+    if buf is None:
+        buf = np.empty((ANALYSIS_SIZE, ANALYSIS_SIZE, 3), dtype=np.uint8)
+        _thread_local.thumbnail = buf
+    # cv2 allocates a fresh array instead if the input isn't 3-channel uint8
+    return cv2.resize(image, (ANALYSIS_SIZE, ANALYSIS_SIZE), dst=buf, interpolation=cv2.INTER_AREA)
+
+
+# Per-channel standard deviation below which an image counts as one colour
+MONOCHROME_STDDEV = 8.0
+
+
+def _color_histogram(image: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Count the pixels of a downsampled image per quantised colour.
+
+    The image is area-averaged to 64x64 (see `_thumbnail`) and each channel
+    quantised to 16 levels, giving up to 4096 colour cells.
+
+    Args:
+        image: BGR image.
+
+    Returns:
+        A tuple of (centers, counts, name_ids) for the non-empty cells, most
+        common first. `centers` is an (n, 3) array of BGR cell centres and
+        `name_ids` index into `_COLOR_NAMES`.
+    """
+    # Area averaging also smooths out JPEG noise, so no extra blur is needed
+    img = _thumbnail(image)
+    pixels = img.reshape((-1, 3))
+    # Near-solid images (plain backgrounds) are a single colour
+    mean, stddev = cv2.meanStdDev(img)
+    if stddev.max() < MONOCHROME_STDDEV:
+        center = mean.reshape((1, 3)).astype(np.int32)
+        name_id = _COLOR_NAME_IDS[_classify_bgr(tuple(int(c) for c in center[0]))]
+        return center, np.array([len(pixels)]), np.array([name_id])
+    # Pack the top four bits of each channel into a 12-bit cell key
+    q = (pixels >> 4).astype(np.uint16)
+    keys = (q[:, 0] << 8) | (q[:, 1] << 4) | q[:, 2]
+    counts = np.bincount(keys, minlength=4096)
+    cells = np.flatnonzero(counts)
+    cells = cells[np.argsort(-counts[cells], kind="stable")]
+    return _cell_centers(cells), counts[cells], _CELL_COLOR_LUT[cells]
+
+
+def _cell_centers(keys: np.ndarray) -> np.ndarray:
+    """Return the (n, 3) BGR centres of 12-bit colour cell keys."""
+    return np.stack([(keys >> 8) & 0xF, (keys >> 4) & 0xF, keys & 0xF], axis=1) * 16 + 8
+
+
 def _dominant_colors(image: np.ndarray, k: int = 3) -> List[Tuple[int, int, int]]:
-    """Compute the dominant colours in an image using k‑means clustering.
+    """Compute the dominant colours in an image using a colour histogram.
 
     Args:
         image: BGR image.
-        k: Number of clusters to find.
+        k: Number of dominant colours to find.
 
     Returns:
-        A list of cluster centres (BGR tuples) sorted by frequency (most
+        A list of colour cell centres (BGR tuples) sorted by frequency (most
         common first).
     """
-    # Apply preprocessing to reduce compression artifacts
-    # Use bilateral filter to smooth while preserving edges
-    img = cv2.bilateralFilter(image, 9, 75, 75)
-    
-    # Apply mild Gaussian blur to further reduce JPEG compression noise
-    img = cv2.GaussianBlur(img, (3, 3), 0)
-    
-    # Resize to speed up clustering
-    img = cv2.resize(img, (64, 64), interpolation=cv2.INTER_LINEAR)
-    # Reshape to a list of pixels
-    data = img.reshape((-1, 3)).astype(np.float32)
-    # Define criteria and apply kmeans
-    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 20, 1.0)
-    _, labels, centers = cv2.kmeans(data, k, None, criteria, 3, cv2.KMEANS_PP_CENTERS)
-    # Convert centres back to integer BGR and count the labels
-    centers = centers.astype(int)
-    counts = Counter(labels.flatten())
-    # Sort cluster centres by frequency descending
-    ordered = sorted(zip(counts.values(), centers), key=lambda x: x[0], reverse=True)
-    dominant = [tuple(map(int, center)) for _, center in ordered]
-    return dominant
+    centers, _, _ = _color_histogram(image)
+    return [tuple(map(int, center)) for center in centers[:k]]
+
+
+def _dominant_color_names(image: np.ndarray, k: int = 3) -> List[str]:
+    """Name the dominant colours in an image, most common first.
+
+    Args:
+        image: BGR image.
+        k: Number of dominant colours to find.
+
+    Returns:
+        Colour names of the `k` most common colour cells.
+    """
+    _, _, name_ids = _color_histogram(image)
+    return [_COLOR_NAMES[idx] for idx in name_ids[:k]]
 
 
 def _get_color_percentages(image: np.ndarray, k: int = 8) -> List[Tuple[str, float]]:
     """Calculate the percentage of each dominant color in an image.
 
+    Every colour cell of the histogram is named through `_CELL_COLOR_LUT` and
+    the pixel counts are summed per name, so each percentage is the share of
+    the image covered by that colour.
+
     Args:
         image: BGR image.
         k: Number of dominant colors to extract.
@@ -207,40 +291,113 @@ def _get_color_percentages(image: np.ndarray, k: int = 8) -> List[Tuple[str, flo
     Returns:
         A list of tuples (color_name, percentage) sorted by percentage descending.
     """
-    # Apply preprocessing to reduce compression artifacts
-    # Use bilateral filter to smooth while preserving edges
-    img = cv2.bilateralFilter(image, 9, 75, 75)
+    _, counts, name_ids = _color_histogram(image)
+    totals = np.bincount(name_ids, weights=counts, minlength=len(_COLOR_NAMES))
+    top = np.argsort(-totals, kind="stable")[:k]
+    top = top[totals[top] > 0]
+    total_pixels = counts.sum()
+    return [(_COLOR_NAMES[idx], float(totals[idx] / total_pixels * 100)) for idx in top]
+
+
+# Fallback palette used when none of the colour ranges match (BGR format)
+_PALETTE_NAMES = ["red", "green", "blue", "yellow", "cyan", "magenta", "white", "black", "grey"]
+_PALETTE_BGR = np.array([
+    (0, 0, 255),
+    (0, 255, 0),
+    (255, 0, 0),
+    (0, 255, 255),
+    (255, 255, 0),
+    (255, 0, 255),
+    (255, 255, 255),
+    (0, 0, 0),
+    (128, 128, 128),
+], dtype=np.int32)
+
+
+# Colour ranges (BGR format) for `_classify_bgr`. Order matters!
+# Check more specific colors first, then general ones.
+_COLOR_CHECKS = [
+    # === NEUTRALS (most general, check first) ===
+    ("white", lambda b, g, r: r > 235 and g > 235 and b > 235),
+    ("lightgrey", lambda b, g, r: r > 200 and g > 200 and b > 200 and r < 235 and abs(r - g) < 30 and abs(g - b) < 30),
+    ("grey", lambda b, g, r: r > 110 and g > 110 and b > 110 and r < 200 and abs(r - g) < 50 and abs(g - b) < 50),
+    ("darkgrey", lambda b, g, r: r > 50 and g > 50 and b > 50 and r < 110 and abs(r - g) < 50 and abs(g - b) < 50),
+    ("black", lambda b, g, r: r < 50 and g < 50 and b < 50),
+    
+    # === BLACKS (dark colors) ===
+    ("maroon", lambda b, g, r: r > 80 and r < 160 and g < 90 and b < 90),
+    ("navy", lambda b, g, r: b > 100 and b < 160 and g < 80 and r < 80),
+    
+    # === PURE COLORS (bright, saturated) ===
+    ("red", lambda b, g, r: r > 220 and g < 100 and b < 100),
+    ("green", lambda b, g, r: g > 200 and r < 140 and b < 140),
+    ("blue", lambda b, g, r: b > 200 and r < 140 and g < 140),
+    ("yellow", lambda b, g, r: g > 220 and r > 220 and b < 100),
+    ("cyan", lambda b, g, r: b > 220 and g > 220 and r < 100),
+    ("magenta", lambda b, g, r: b > 220 and r > 220 and g < 100),
+    
+    # === DARK SATURATED COLORS ===
+    ("darkred", lambda b, g, r: r > 120 and r < 200 and g < 80 and b < 80),
+    ("darkgreen", lambda b, g, r: g > 100 and g < 180 and r < 100 and b < 100),
+    ("darkblue", lambda b, g, r: b > 120 and b < 200 and r < 100 and g < 100),
+    
+    # === ORANGES (R and G high, B low) ===
+    ("orange", lambda b, g, r: r > 200 and g > 140 and b < 100 and r > g),
+    ("darkorange", lambda b, g, r: r > 160 and r < 200 and g > 100 and g < 160 and b < 100),
+    ("orangered", lambda b, g, r: r > 180 and g > 80 and g < 140 and b < 100),
     
-    # Apply mild Gaussian blur to further reduce JPEG compression noise
-    img = cv2.GaussianBlur(img, (3, 3), 0)
+    # === YELLOWY TONES ===
+    ("gold", lambda b, g, r: g > 180 and r > 180 and b < 100 and abs(r - g) < 80),
+    ("khaki", lambda b, g, r: r > 190 and g > 200 and b > 140 and b < 180),
+    ("tan", lambda b, g, r: r > 150 and g > 130 and b > 100 and r > g and g > b),
     
-    # Resize to speed up clustering
-    img = cv2.resize(img, (64, 64), interpolation=cv2.INTER_LINEAR)
-    # Reshape to a list of pixels
-    data = img.reshape((-1, 3)).astype(np.float32)
-    # Define criteria and apply kmeans
-    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 20, 1.0)
-    _, labels, centers = cv2.kmeans(data, k, None, criteria, 3, cv2.KMEANS_PP_CENTERS)
-    # Convert centres back to integer BGR and count the labels
-    centers = centers.astype(int)
-    counts = Counter(labels.flatten())
-    total_pixels = labels.size
+    # === BROWNISH ===
+    ("brown", lambda b, g, r: r > 80 and r < 180 and g > 50 and g < 130 and b > 40 and b < 120),
+    ("chocolate", lambda b, g, r: r > 140 and r < 200 and g > 70 and g < 140 and b > 30 and b < 100),
+    ("saddlebrown", lambda b, g, r: r > 70 and r < 140 and g > 40 and g < 100 and b > 30 and b < 90),
+    ("peru", lambda b, g, r: r > 160 and g > 120 and g < 180 and b > 60 and b < 130),
+    ("beige", lambda b, g, r: r > 200 and g > 200 and b > 180 and r < 240),
+    ("ivory", lambda b, g, r: r > 240 and g > 240 and b > 230),
     
-    # Calculate percentages and map to color names
-    color_data = []
-    for center_idx, (count, center) in enumerate(sorted(zip(counts.values(), centers), key=lambda x: x[0], reverse=True)):
-        percentage = (count / total_pixels) * 100
-        color_name = _bgr_to_color_name(tuple(map(int, center)))
-        color_data.append((color_name, percentage))
+    # === GREENS (various) ===
+    ("lime", lambda b, g, r: g > 200 and r < 120 and b < 120),
+    ("forestgreen", lambda b, g, r: g > 100 and g < 170 and r > 40 and r < 130 and b > 40 and b < 130),
+    ("teal", lambda b, g, r: b > 120 and g > 120 and r < 100),
+    ("olive", lambda b, g, r: g > 100 and r > 80 and r < 150 and b < 100),
     
-    return color_data
+    # === BLUES (various shades) ===
+    ("navy", lambda b, g, r: b > 100 and b < 160 and g < 80 and r < 80),
+    ("royalblue", lambda b, g, r: b > 180 and g > 80 and g < 150 and r > 50 and r < 130),
+    ("cornflowerblue", lambda b, g, r: b > 190 and g > 110 and g < 170 and r > 80 and r < 160),
+    ("skyblue", lambda b, g, r: b > 210 and g > 190 and r > 160 and r < 220),
+    ("lightblue", lambda b, g, r: b > 210 and g > 190 and r > 140 and r < 200),
+    ("turquoise", lambda b, g, r: b > 160 and g > 160 and r < 140),
+    
+    # === PURPLES AND VIOLETS (high B and R, low G) ===
+    ("darkviolet", lambda b, g, r: b > 160 and r > 160 and g < 100),
+    ("purple", lambda b, g, r: b > 140 and r > 140 and abs(b - r) < 70 and g < 130),
+    ("indigo", lambda b, g, r: b > 130 and g < 110 and r > 70 and r < 140),
+    ("violet", lambda b, g, r: b > 190 and r > 190 and g > 100 and g < 190),
+    
+    # === PINKS (high R and B, moderate G) ===
+    ("hotpink", lambda b, g, r: b > 160 and r > 230 and g > 100 and g < 170),
+    ("pink", lambda b, g, r: b > 160 and r > 220 and g > 130 and g < 210),
+    ("lightpink", lambda b, g, r: b > 220 and r > 240 and g > 190),
+    ("salmon", lambda b, g, r: b > 160 and r > 220 and g > 150 and g < 200),
+    ("lightsalmon", lambda b, g, r: b > 210 and r > 240 and g > 190),
+    
+    # === REDS (special shades) ===
+    ("crimson", lambda b, g, r: r > 180 and g < 110 and b < 100 and r - g > 60),
+    ("silver", lambda b, g, r: r > 190 and g > 190 and b > 190 and r < 240),
+]
 
 
-def _bgr_to_color_name(bgr: Tuple[int, int, int]) -> str:
-    """Map a BGR colour to a human friendly colour name with lenient tolerance.
+def _classify_bgr(bgr: Tuple[int, int, int]) -> str:
+    """Run the colour range checks on a single BGR colour.
 
     Uses range-based detection with generous tolerances to catch color variations.
-    Order matters - more specific colors are checked first.
+    Order matters - more specific colors are checked first. Histogram cells
+    are named through `_CELL_COLOR_LUT`, which is precomputed with this.
 
     Args:
         bgr: A 3‑tuple of (blue, green, red) values.
@@ -250,117 +407,50 @@ def _bgr_to_color_name(bgr: Tuple[int, int, int]) -> str:
     """
     b, g, r = bgr
     
-    # Define color ranges (BGR format). Order matters!
-    # Check more specific colors first, then general ones.
-    color_checks = [
-        # === NEUTRALS (most general, check first) ===
-        ("white", lambda b, g, r: r > 235 and g > 235 and b > 235),
-        ("lightgrey", lambda b, g, r: r > 200 and g > 200 and b > 200 and r < 235 and abs(r - g) < 30 and abs(g - b) < 30),
-        ("grey", lambda b, g, r: r > 110 and g > 110 and b > 110 and r < 200 and abs(r - g) < 50 and abs(g - b) < 50),
-        ("darkgrey", lambda b, g, r: r > 50 and g > 50 and b > 50 and r < 110 and abs(r - g) < 50 and abs(g - b) < 50),
-        ("black", lambda b, g, r: r < 50 and g < 50 and b < 50),
-        
-        # === BLACKS (dark colors) ===
-        ("maroon", lambda b, g, r: r > 80 and r < 160 and g < 90 and b < 90),
-        ("navy", lambda b, g, r: b > 100 and b < 160 and g < 80 and r < 80),
-        
-        # === PURE COLORS (bright, saturated) ===
-        ("red", lambda b, g, r: r > 220 and g < 100 and b < 100),
-        ("green", lambda b, g, r: g > 200 and r < 140 and b < 140),
-        ("blue", lambda b, g, r: b > 200 and r < 140 and g < 140),
-        ("yellow", lambda b, g, r: g > 220 and r > 220 and b < 100),
-        ("cyan", lambda b, g, r: b > 220 and g > 220 and r < 100),
-        ("magenta", lambda b, g, r: b > 220 and r > 220 and g < 100),
-        
-        # === DARK SATURATED COLORS ===
-        ("darkred", lambda b, g, r: r > 120 and r < 200 and g < 80 and b < 80),
-        ("darkgreen", lambda b, g, r: g > 100 and g < 180 and r < 100 and b < 100),
-        ("darkblue", lambda b, g, r: b > 120 and b < 200 and r < 100 and g < 100),
-        
-        # === ORANGES (R and G high, B low) ===
-        ("orange", lambda b, g, r: r > 200 and g > 140 and b < 100 and r > g),
-        ("darkorange", lambda b, g, r: r > 160 and r < 200 and g > 100 and g < 160 and b < 100),
-        ("orangered", lambda b, g, r: r > 180 and g > 80 and g < 140 and b < 100),
-        
-        # === YELLOWY TONES ===
-        ("gold", lambda b, g, r: g > 180 and r > 180 and b < 100 and abs(r - g) < 80),
-        ("khaki", lambda b, g, r: r > 190 and g > 200 and b > 140 and b < 180),
-        ("tan", lambda b, g, r: r > 150 and g > 130 and b > 100 and r > g and g > b),
-        
-        # === BROWNISH ===
-        ("brown", lambda b, g, r: r > 80 and r < 180 and g > 50 and g < 130 and b > 40 and b < 120),
-        ("chocolate", lambda b, g, r: r > 140 and r < 200 and g > 70 and g < 140 and b > 30 and b < 100),
-        ("saddlebrown", lambda b, g, r: r > 70 and r < 140 and g > 40 and g < 100 and b > 30 and b < 90),
-        ("peru", lambda b, g, r: r > 160 and g > 120 and g < 180 and b > 60 and b < 130),
-        ("beige", lambda b, g, r: r > 200 and g > 200 and b > 180 and r < 240),
-        ("ivory", lambda b, g, r: r > 240 and g > 240 and b > 230),
-        
-        # === GREENS (various) ===
-        ("lime", lambda b, g, r: g > 200 and r < 120 and b < 120),
-        ("forestgreen", lambda b, g, r: g > 100 and g < 170 and r > 40 and r < 130 and b > 40 and b < 130),
-        ("teal", lambda b, g, r: b > 120 and g > 120 and r < 100),
-        ("olive", lambda b, g, r: g > 100 and r > 80 and r < 150 and b < 100),
-        
-        # === BLUES (various shades) ===
-        ("navy", lambda b, g, r: b > 100 and b < 160 and g < 80 and r < 80),
-        ("royalblue", lambda b, g, r: b > 180 and g > 80 and g < 150 and r > 50 and r < 130),
-        ("cornflowerblue", lambda b, g, r: b > 190 and g > 110 and g < 170 and r > 80 and r < 160),
-        ("skyblue", lambda b, g, r: b > 210 and g > 190 and r > 160 and r < 220),
-        ("lightblue", lambda b, g, r: b > 210 and g > 190 and r > 140 and r < 200),
-        ("turquoise", lambda b, g, r: b > 160 and g > 160 and r < 140),
-        
-        # === PURPLES AND VIOLETS (high B and R, low G) ===
-        ("darkviolet", lambda b, g, r: b > 160 and r > 160 and g < 100),
-        ("purple", lambda b, g, r: b > 140 and r > 140 and abs(b - r) < 70 and g < 130),
-        ("indigo", lambda b, g, r: b > 130 and g < 110 and r > 70 and r < 140),
-        ("violet", lambda b, g, r: b > 190 and r > 190 and g > 100 and g < 190),
-        
-        # === PINKS (high R and B, moderate G) ===
-        ("hotpink", lambda b, g, r: b > 160 and r > 230 and g > 100 and g < 170),
-        ("pink", lambda b, g, r: b > 160 and r > 220 and g > 130 and g < 210),
-        ("lightpink", lambda b, g, r: b > 220 and r > 240 and g > 190),
-        ("salmon", lambda b, g, r: b > 160 and r > 220 and g > 150 and g < 200),
-        ("lightsalmon", lambda b, g, r: b > 210 and r > 240 and g > 190),
-        
-        # === REDS (special shades) ===
-        ("crimson", lambda b, g, r: r > 180 and g < 110 and b < 100 and r - g > 60),
-        ("silver", lambda b, g, r: r > 190 and g > 190 and b > 190 and r < 240),
-    ]
-    
     # Check each color range in order
-    for color_name, check_func in color_checks:
+    for color_name, check_func in _COLOR_CHECKS:
         if check_func(b, g, r):
             return color_name
     
-    # Fallback: use palette-based distance method
-    palette = {
-        "red": (0, 0, 255),
-        "green": (0, 255, 0),
-        "blue": (255, 0, 0),
-        "yellow": (0, 255, 255),
-        "cyan": (255, 255, 0),
-        "magenta": (255, 0, 255),
-        "white": (255, 255, 255),
-        "black": (0, 0, 0),
-        "grey": (128, 128, 128),
-    }
-    
-    min_dist = float("inf")
-    best_name = "unknown"
-    for name, (pb, pg, pr) in palette.items():
-        dist = (b - pb) ** 2 + (g - pg) ** 2 + (r - pr) ** 2
-        if dist < min_dist:
-            min_dist = dist
-            best_name = name
-    return best_name
+    # Fallback: nearest palette entry by squared BGR distance
+    diff = _PALETTE_BGR - np.asarray(bgr, dtype=np.int32)
+    return _PALETTE_NAMES[int(np.argmin(np.einsum('ij,ij->i', diff, diff)))]
+
+
+# Every name `_classify_bgr` can return, and the id used for it in lookup tables
+_COLOR_NAMES = list(dict.fromkeys([name for name, _ in _COLOR_CHECKS] + _PALETTE_NAMES))
+_COLOR_NAME_IDS = {name: idx for idx, name in enumerate(_COLOR_NAMES)}
+
+
+def _build_cell_color_lut() -> np.ndarray:
+    """Classify the centre of every 12-bit colour cell once with `_classify_bgr`.
+
+    Returns:
+        An array mapping each cell key (as packed by `_color_histogram`) to
+        an index into `_COLOR_NAMES`.
+    """
+    centers = _cell_centers(np.arange(4096))
+    return np.array(
+        [_COLOR_NAME_IDS[_classify_bgr(tuple(int(c) for c in center))] for center in centers],
+        dtype=np.uint8,
+    )
+
+
+_CELL_COLOR_LUT = _build_cell_color_lut()
+
+
+# BT.601 luma weights in BGR channel order
+_BT601_BGR = np.array([0.114, 0.587, 0.299])
 
 
 def _brightness_tag(image: np.ndarray) -> str:
     """Compute a brightness tag for an image.
 
-    The function converts the image to grayscale and computes the
-    average pixel intensity. Depending on the value, it returns one
-    of three tags: `"bright"`, `"normal"`, or `"dark"`.
+    The function computes the average luma of a 64x64 area-averaged
+    thumbnail from its per-channel means (`cv2.mean`, weighted with the
+    BT.601 coefficients used by `cv2.cvtColor`), without materialising a
+    full-size grayscale copy. Depending on the value,
+    it returns one of three tags: `"bright"`, `"normal"`, or `"dark"`.
 
     Args:
         image: BGR image.
@@ -368,8 +458,12 @@ def _brightness_tag(image: np.ndarray) -> str:
     Returns:
         A brightness tag string.
     """
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    avg_intensity = np.mean(gray)
+    if image.size == 0:
+        return "normal"
+    # An area-averaged thumbnail has (almost exactly) the same channel means
+    small = _thumbnail(image)
+    means = np.array(cv2.mean(small)[:3])
+    avg_intensity = float(means @ _BT601_BGR)
     if avg_intensity > 180:
         return "bright"
     if avg_intensity < 70:
@@ -409,12 +503,12 @@ def _get_item_colors(image: np.ndarray, bbox: Tuple[int, int, int, int], item_na
     
     color_tags = []
     try:
-        dominant_colors = _dominant_colors(roi, k=2)
-        for color_idx, color in enumerate(dominant_colors[:2]):
-            color_name = _bgr_to_color_name(color)
+        dominant_colors = _dominant_color_names(roi, k=2)
+        for color_idx, color_name in enumerate(dominant_colors[:2]):
             tag = f"color_{color_name}_{item_name}"
             color_tags.append(tag)
-            debug_print(f"    {color_name} -> {tag}")
+            if _DEBUG:
+                debug_print(f"    {color_name} -> {tag}")
     except Exception as e:
         debug_print(f"  Color extraction error: {e}")
     
@@ -436,6 +530,46 @@ def _get_clothing_attributes(image: np.ndarray, items: List[Tuple[str, Tuple[int
     return []
 
 
+# Colour analysis results keyed by a hash of the encoded image bytes.
+# Yupoo often reuses the same cover across product variants, so repeats
+# skip decoding and colour analysis entirely.
+COLOR_CACHE_SIZE = 8192
+_color_cache: "OrderedDict[bytes, Tuple[Tuple[str, float], ...]]" = OrderedDict()
+_color_cache_lock = threading.Lock()
+
+
+def _get_cached_color_percentages(image_bytes: bytes, source: str) -> Tuple[Tuple[str, float], ...]:
+    """Return `_get_color_percentages` for encoded image bytes, memoised by content.
+
+    Args:
+        image_bytes: Encoded image bytes.
+        source: Where the bytes came from, for error messages.
+
+    Returns:
+        Tuples of (color_name, percentage) sorted by percentage descending.
+
+    Raises:
+        ImageDecodeError: If the bytes cannot be decoded.
+    """
+    digest = hashlib.blake2b(image_bytes, digest_size=16).digest()
+    with _color_cache_lock:
+        cached = _color_cache.get(digest)
+        if cached is not None:
+            _color_cache.move_to_end(digest)
+            if _DEBUG:
+                debug_print(f"Color analysis cache hit for {source}")
+            return cached
+    
+    # Analysis works on a 64x64 thumbnail, so a reduced-resolution decode is plenty
+    image = _decode_image(image_bytes, source, COLOR_DECODE_SCALE)
+    result = tuple(_get_color_percentages(image, k=8))
+    with _color_cache_lock:
+        _color_cache[digest] = result
+        if len(_color_cache) > COLOR_CACHE_SIZE:
+            _color_cache.popitem(last=False)
+    return result
+
+
 def generate_tags_for_image(url: str, album_title: str = "") -> Tuple[List[str], dict]:
     """Generate color tags from the image and company tags from album title.
     
@@ -443,47 +577,85 @@ def generate_tags_for_image(url: str, album_title: str = "") -> Tuple[List[str],
         A tuple of (tags_list, color_data_dict) where color_data_dict contains
         color percentages for sorting.
     """
-    debug_print(f"\n{'='*70}")
-    debug_print(f"[TAG GENERATION START]")
+    # Not memoised by URL: retagging must re-download covers that changed.
+    # Repeated image content still hits the content-hash colour cache.
+    return generate_tags_for_image_from_bytes(_fetch_image_bytes(url), album_title, source=url)
+
+
+def generate_tags_for_image_from_bytes(
+    image_bytes: bytes, album_title: str = "", source: str = "image data"
+) -> Tuple[List[str], dict]:
+    """Generate tags like `generate_tags_for_image` from already downloaded bytes.
+
+    Use this when the caller has the encoded image anyway (e.g. to save it
+    locally) so the image is not fetched a second time.
+
+    Args:
+        image_bytes: Encoded image bytes.
+        album_title: Album title to extract brand names from.
+        source: Where the bytes came from, for log and error messages.
+
+    Returns:
+        A tuple of (tags_list, color_data_dict) where color_data_dict contains
+        color percentages for sorting.
+    """
+    if _DEBUG:
+        debug_print(f"\n{'='*70}")
+        debug_print(f"[TAG GENERATION START]")
     try:
-        image = _fetch_image_array(url)
-        tags: List[str] = []
+        # Insertion-ordered dict doubles as an O(1) duplicate check
+        tags: Dict[str, None] = {}
         color_data: dict = {}  # Store color percentages for database
         
         # === DOMINANT IMAGE COLORS WITH PERCENTAGES ===
-        debug_print(f"\n[ANALYZING] Extracting dominant colors from image")
-        color_percentages = _get_color_percentages(image, k=8)
+        if _DEBUG:
+            debug_print(f"\n[ANALYZING] Extracting dominant colors from image")
+        color_percentages = _get_cached_color_percentages(image_bytes, source)
         
         for idx, (color_name, percentage) in enumerate(color_percentages):
             tag = f"color_{color_name}"
             if tag not in tags:
-                tags.append(tag)
+                tags[tag] = None
                 color_data[color_name] = round(percentage, 2)
-                debug_print(f"  [{idx+1}] {tag} ({percentage:.1f}%)")
+                if _DEBUG:
+                    debug_print(f"  [{idx+1}] {tag} ({percentage:.1f}%)")
         
-        debug_print(f"[RESULT] Found {len(tags)} unique colors")
+        if _DEBUG:
+            debug_print(f"[RESULT] Found {len(tags)} unique colors")
         
         # === EXTRACT COMPANY NAMES FROM ALBUM TITLE ===
         if album_title:
-            debug_print(f"\n[ANALYZING] Extracting brand names from title: {album_title}")
+            if _DEBUG:
+                debug_print(f"\n[ANALYZING] Extracting brand names from title: {album_title}")
             brands = translator.extract_brands_from_text(album_title)
             if brands:
                 for brand in brands:
                     tag = f"company_{brand.lower().replace(' ', '_')}"
                     if tag not in tags:
-                        tags.append(tag)
-                        debug_print(f"  [BRAND] {tag}")
-                debug_print(f"[RESULT] Found {len(brands)} brands")
+                        tags[tag] = None
+                        if _DEBUG:
+                            debug_print(f"  [BRAND] {tag}")
+                if _DEBUG:
+                    debug_print(f"[RESULT] Found {len(brands)} brands")
             else:
-                debug_print(f"[RESULT] No brands detected in title")
+                if _DEBUG:
+                    debug_print(f"[RESULT] No brands detected in title")
         
-        final_tags = list(dict.fromkeys(tags))
-        debug_print(f"\n[TAG GENERATION COMPLETE]")
-        debug_print(f"  Total tags: {len(final_tags)}")
-        debug_print(f"  Tags: {final_tags}")
-        debug_print(f"  Color percentages: {color_data}")
-        debug_print(f"{'='*70}\n")
+        final_tags = list(tags)
+        if _DEBUG:
+            debug_print(f"\n[TAG GENERATION COMPLETE]")
+            debug_print(f"  Total tags: {len(final_tags)}")
+            debug_print(f"  Tags: {final_tags}")
+            debug_print(f"  Color percentages: {color_data}")
+            debug_print(f"{'='*70}\n")
         return final_tags, color_data
     except Exception as e:
         debug_print(f"[ERROR] {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+# Images tagged concurrently by callers' thread pools (scrape covers and
+# retagging). Downloads and OpenCV/NumPy work release the GIL, so threads
+# overlap network and CPU; two per core keeps the cores busy without
+# oversubscribing small machines.
+TAGGING_WORKERS = min(16, (os.cpu_count() or 1) * 2)